@@ -1,10 +1,12 @@
+import math
 import time
+import threading
 import matplotlib.pyplot as plt
+import numpy as np
+from collections import OrderedDict
 from decimal import Decimal, Context, ROUND_HALF_EVEN
 from tabulate import tabulate
-import sys
-
-sys.setrecursionlimit(16000)
+from adaptive_sweep import adaptive_sweep, extrapolate
 
 
 # 1. recursive method
@@ -27,16 +29,90 @@ def fibonacci_dynamic(nr):
     return fib[nr]
 
 
+# bounded memo with least recently used eviction, safe to share between threads
+class LRUMemo:
+    def __init__(self, maxsize=1024):
+        self.maxsize = maxsize
+        self._data = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def get(self, key):
+        with self._lock:
+            if key in self._data:
+                self._data.move_to_end(key)
+                self.hits += 1
+                return self._data[key]
+            self.misses += 1
+            return None
+
+    # value or None without touching the hit / miss counters or the recency order
+    def peek(self, key):
+        with self._lock:
+            return self._data.get(key)
+
+    def put(self, key, value):
+        with self._lock:
+            self._data[key] = value
+            self._data.move_to_end(key)
+            while len(self._data) > self.maxsize:
+                self._data.popitem(last=False)
+                self.evictions += 1
+
+    # drop all entries and counters, call between benchmark runs
+    def clear(self):
+        with self._lock:
+            self._data.clear()
+            self.hits = 0
+            self.misses = 0
+            self.evictions = 0
+
+    def stats(self):
+        with self._lock:
+            return {'size': len(self._data), 'hits': self.hits, 'misses': self.misses, 'evictions': self.evictions}
+
+
+fibonacci_memo = LRUMemo()
+
+# on the way up only every MEMO_CHECKPOINT_STEP-th pair of consecutive terms is stored, plus the last two,
+# so a cold call for n puts about 2n / MEMO_CHECKPOINT_STEP entries and the 1024 entry memo covers n up to ~130000
+MEMO_CHECKPOINT_STEP = 256
+
+
 # 3. backtracking with memorization method
-def fibonacci_backtracking(nr, memo={}):
+def fibonacci_backtracking(nr, memo=None):
+    if memo is None:
+        memo = fibonacci_memo
     if nr <= 0:
         return 0
     elif nr == 1:
         return 1
-    elif nr in memo:
-        return memo[nr]
-    memo[nr] = fibonacci_backtracking(nr - 1, memo) + fibonacci_backtracking(nr - 2, memo)
-    return memo[nr]
+
+    # one hit or miss per call, the walk below only peeks
+    value = memo.get(nr)
+    if value is not None:
+        return value
+
+    # walk down instead of recursing until two consecutive terms are known: the pair just below nr,
+    # then the checkpoints (c, c + 1) with c a multiple of MEMO_CHECKPOINT_STEP
+    k, a, b = 1, 0, 1
+    candidates = [nr - 1] + list(range((nr - 2) // MEMO_CHECKPOINT_STEP * MEMO_CHECKPOINT_STEP + 1, 1,
+                                       -MEMO_CHECKPOINT_STEP))
+    for candidate in candidates:
+        found_b = memo.peek(candidate)
+        found_a = memo.peek(candidate - 1) if found_b is not None else None
+        if found_a is not None:
+            k, a, b = candidate, found_a, found_b
+            break
+
+    # then climb back up to nr, storing the checkpoints and the last two terms
+    for i in range(k + 1, nr + 1):
+        a, b = b, a + b
+        if i % MEMO_CHECKPOINT_STEP <= 1 or i >= nr - 1:
+            memo.put(i, b)
+    return b
 
 
 # 4. matrix method
@@ -60,10 +136,19 @@ def multiply(F, M):
     F[1][1] = w
 
 
+# raise F to the nr-th power in place with exponentiation by squaring (O(log n) multiplications)
 def power(F, nr):
-    M = [[1, 1], [1, 0]]
-    for i in range(2, nr + 1):
-        multiply(F, M)
+    if nr <= 1:
+        return
+    result = [[1, 0], [0, 1]]
+    base = [F[0][:], F[1][:]]
+    while nr:
+        if nr & 1:
+            multiply(result, base)
+        multiply(base, base)
+        nr >>= 1
+    F[0][:] = result[0]
+    F[1][:] = result[1]
 
 
 # 5. Binet Formula
@@ -74,6 +159,35 @@ def fibonacci_binet(nr):
     return int((ctx.power(phi, Decimal(nr)) - ctx.power(phi2, Decimal(nr))) / (2**nr * Decimal(5**(1/2))))
 
 
+# 5b. Binet formula with precision chosen from n
+# sqrt(5) and phi are kept at the highest precision computed so far and reused by later calls
+_binet_cache = {'prec': 0, 'sqrt5': None, 'phi': None}
+
+
+def _binet_constants(prec):
+    if _binet_cache['prec'] < prec:
+        # grow geometrically so a sweep over increasing n recomputes the constants only a few times
+        new_prec = max(prec, 2 * _binet_cache['prec'])
+        ctx = Context(prec=new_prec, rounding=ROUND_HALF_EVEN)
+        sqrt5 = ctx.sqrt(Decimal(5))
+        _binet_cache['prec'] = new_prec
+        _binet_cache['sqrt5'] = sqrt5
+        _binet_cache['phi'] = ctx.divide(ctx.add(Decimal(1), sqrt5), Decimal(2))
+    return _binet_cache['sqrt5'], _binet_cache['phi']
+
+
+def fibonacci_binet_adaptive(nr):
+    if nr <= 0:
+        return 0
+    # F(n) has about n * log10(phi) digits, plus guard digits for the rounding in power and divide
+    prec = int(nr * 0.20898764024997873) + 20
+    ctx = Context(prec=prec, rounding=ROUND_HALF_EVEN)
+    sqrt5, phi = _binet_constants(prec)
+    # |psi^n / sqrt(5)| < 1/2, so F(n) is phi^n / sqrt(5) rounded to the nearest integer
+    value = ctx.divide(ctx.power(ctx.plus(phi), nr), ctx.plus(sqrt5))
+    return int(value.to_integral_value(rounding=ROUND_HALF_EVEN))
+
+
 # 6. iterative method
 def fibonacci_iterative(nr):
     a, b = 0, 1
@@ -82,6 +196,161 @@ def fibonacci_iterative(nr):
     return a
 
 
+# 7. fast doubling method
+# F(2k) = F(k) * (2 * F(k + 1) - F(k)), F(2k + 1) = F(k)^2 + F(k + 1)^2
+def fibonacci_fast_doubling(nr):
+    return _fibonacci_pair(nr)[0]
+
+
+# returns (F(n), F(n + 1))
+def _fibonacci_pair(nr):
+    a, b = 0, 1
+    for bit in bin(max(nr, 0))[2:]:
+        a, b = a * (2 * b - a), a * a + b * b
+        if bit == '1':
+            a, b = b, a + b
+    return a, b
+
+
+# stream F(lo), F(lo + 1), ..., F(hi - 1), one addition per term after the first
+def fib_range(lo, hi):
+    lo = max(lo, 0)
+    if lo >= hi:
+        return
+    a, b = _fibonacci_pair(lo)
+    for _ in range(lo, hi):
+        yield a
+        a, b = b, a + b
+
+
+# F(92) is the largest term that fits in int64
+FIB_INT64_MAX_N = 92
+_FIB_INT64_TABLE = np.array(list(fib_range(0, FIB_INT64_MAX_N + 1)), dtype=np.int64)
+
+# gaps up to this size are walked with additions, larger ones jump with fast doubling
+_FIB_MANY_STEP_LIMIT = 64
+
+
+# F(n) for every n in ns, returned in the same order as ns
+def fib_many(ns):
+    ns = np.maximum(np.asarray(ns, dtype=np.int64), 0)
+
+    # small n: a single table lookup for all queries, returned as an int64 array
+    if ns.size == 0 or ns.max() <= FIB_INT64_MAX_N:
+        return _FIB_INT64_TABLE[ns]
+
+    # big n: answer queries in increasing order and carry (F(n), F(n + 1)) from one to the next
+    order = np.argsort(ns, kind='stable')
+    result = [0] * ns.size
+    current, a, b = 0, 0, 1
+    for idx in order.tolist():
+        n = int(ns[idx])
+        gap = n - current
+        if gap > _FIB_MANY_STEP_LIMIT:
+            a, b = _fibonacci_pair(n)
+        else:
+            for _ in range(gap):
+                a, b = b, a + b
+        current = n
+        result[idx] = a
+    return result
+
+
+# 8. modular method for huge n
+# (F(n) mod m, F(n + 1) mod m) by fast doubling, every product reduced mod m
+def _fibonacci_pair_mod(nr, m):
+    a, b = 0, 1 % m
+    for bit in bin(max(nr, 0))[2:]:
+        a, b = a * (2 * b - a) % m, (a * a + b * b) % m
+        if bit == '1':
+            a, b = b, (a + b) % m
+    return a, b
+
+
+def _factorize(n):
+    factors = {}
+    d = 2
+    while d * d <= n:
+        while n % d == 0:
+            factors[d] = factors.get(d, 0) + 1
+            n //= d
+        d += 1 if d == 2 else 2
+    if n > 1:
+        factors[n] = factors.get(n, 0) + 1
+    return factors
+
+
+pisano_cache = LRUMemo(maxsize=4096)
+
+# the period costs two trial division factorizations, O(sqrt(m)), while fast doubling mod m is O(log n) anyway;
+# above this modulus fibonacci_mod skips the period and doubles on the full n
+PISANO_MODULUS_LIMIT = 10 ** 10
+
+
+# period of F(n) mod m, cached per modulus; O(sqrt(m)) on the first call for m
+def pisano_period(m):
+    if m == 1:
+        return 1
+    period = pisano_cache.get(m)
+    if period is not None:
+        return period
+
+    # pi(p^k) divides p^(k-1) * pi(p), and pi(p) divides 3, 20, p - 1 or 2(p + 1) depending on p mod 5
+    period = 1
+    for p, k in _factorize(m).items():
+        if p == 2:
+            bound = 3
+        elif p == 5:
+            bound = 20
+        elif p % 5 in (1, 4):
+            bound = p - 1
+        else:
+            bound = 2 * (p + 1)
+        period = math.lcm(period, p ** (k - 1) * bound)
+
+    # the periods are exactly the multiples of pi(m), so strip prime factors while the result is still a period
+    for q in _factorize(period):
+        while period % q == 0 and _fibonacci_pair_mod(period // q, m) == (0, 1):
+            period //= q
+
+    pisano_cache.put(m, period)
+    return period
+
+
+def fibonacci_mod(nr, m):
+    if m == 1:
+        return 0
+    if m > PISANO_MODULUS_LIMIT:
+        return _fibonacci_pair_mod(nr, m)[0]
+    return _fibonacci_pair_mod(nr % pisano_period(m), m)[0]
+
+
+# F(n) mod m for every (n, m) pair, grouped by modulus so each period is looked up once (moduli up to
+# PISANO_MODULUS_LIMIT, larger ones double on the full n)
+def fibonacci_mod_many(pairs):
+    pairs = list(pairs)
+    result = [0] * len(pairs)
+    by_modulus = {}
+    for idx, (n, m) in enumerate(pairs):
+        by_modulus.setdefault(m, []).append(idx)
+    for m, indices in by_modulus.items():
+        if m == 1:
+            continue
+        period = pisano_period(m) if m <= PISANO_MODULUS_LIMIT else None
+        for idx in indices:
+            n = pairs[idx][0] % period if period else pairs[idx][0]
+            result[idx] = _fibonacci_pair_mod(n, m)[0]
+    return result
+
+
+# fixed modulus used when timing fibonacci_mod next to the exact methods
+FIB_MOD_BENCH_MODULUS = 10 ** 9 + 7
+
+
+def fibonacci_mod_bench(nr):
+    return fibonacci_mod(nr, FIB_MOD_BENCH_MODULUS)
+
+
 # measure time
 def measure_time(func, arg):
     start_time = time.time()
@@ -91,20 +360,25 @@ def measure_time(func, arg):
 
 
 # inputs
-input_1 = [5, 7, 10, 12, 15, 17, 20, 22, 25, 27, 30, 32, 35, 37, 40, 42, 45]
+# the recursive method is swept from n = 5 until its time budget (seconds) runs out
+RECURSIVE_BUDGET = 30.0
+# sizes past the sweep whose time is extrapolated from the fitted curve
+input_1_targets = [30, 35, 40, 45, 50]
 input_2 = [501, 631, 794, 1000, 1259, 1585, 1995, 2512, 3162, 3981, 5012, 6310, 7943, 10000, 12589, 15849]
 
 results = {method.__name__: {'values': [], 'times': []} for method in
            [fibonacci_recursive, fibonacci_dynamic, fibonacci_backtracking, fibonacci_matrix, fibonacci_binet,
-            fibonacci_iterative]}
+            fibonacci_iterative, fibonacci_fast_doubling, fibonacci_binet_adaptive, fibonacci_mod_bench]}
 
 
-for n in input_1:
-    _, time_taken = measure_time(fibonacci_recursive, n)
-    results['fibonacci_recursive']['times'].append(time_taken)
+input_1, results['fibonacci_recursive']['times'] = adaptive_sweep(
+    lambda n: measure_time(fibonacci_recursive, n)[1], 5, RECURSIVE_BUDGET, growth=1.25)
 
 for n in input_2:
-    for method in [fibonacci_dynamic, fibonacci_backtracking, fibonacci_matrix, fibonacci_binet, fibonacci_iterative]:
+    # start every n from an empty memo so the backtracking times are not just cache hits
+    fibonacci_memo.clear()
+    for method in [fibonacci_dynamic, fibonacci_backtracking, fibonacci_matrix, fibonacci_binet, fibonacci_iterative,
+                   fibonacci_fast_doubling, fibonacci_binet_adaptive, fibonacci_mod_bench]:
         _, time_taken = measure_time(method, n)
         results[method.__name__]['times'].append(time_taken)
 
@@ -138,8 +412,17 @@ for n, time_taken in zip(input_1, results['fibonacci_recursive']['times']):
 print("\nRecursive Method Results:")
 print(tabulate(recursive_table, headers="firstrow", tablefmt="grid"))
 
+extrapolated_table = [["n", "Predicted time (seconds)"]]
+targets = [n for n in input_1_targets if n > input_1[-1]]
+for n, time_taken in zip(targets, extrapolate(input_1, results['fibonacci_recursive']['times'], targets)):
+    extrapolated_table.append([n, f"{time_taken:.6f}"])
+
+print("\nRecursive Method Extrapolated Past the Budget:")
+print(tabulate(extrapolated_table, headers="firstrow", tablefmt="grid"))
+
 # print results for other methods
-methods = ['fibonacci_dynamic', 'fibonacci_backtracking', 'fibonacci_matrix', 'fibonacci_binet', 'fibonacci_iterative']
+methods = ['fibonacci_dynamic', 'fibonacci_backtracking', 'fibonacci_matrix', 'fibonacci_binet', 'fibonacci_iterative',
+           'fibonacci_fast_doubling', 'fibonacci_binet_adaptive', 'fibonacci_mod_bench']
 methods_table = [["n"] + methods]
 
 for i, n in enumerate(input_2):
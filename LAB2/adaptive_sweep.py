@@ -0,0 +1,93 @@
+import math
+import time
+# time-budgeted input sweep
+# the input size keeps growing geometrically while the fitted curve says the next run still fits in the budget,
+# then bisects towards the largest size that fits, so slow algorithms are measured as far as the budget allows
+
+
+# least squares line through (xs, ys), returns slope, intercept and the sum of squared residuals
+def _least_squares(xs, ys):
+    count = len(xs)
+    mean_x = sum(xs) / count
+    mean_y = sum(ys) / count
+    sxx = sum((x - mean_x) ** 2 for x in xs)
+    if sxx == 0:
+        return 0.0, mean_y, 0.0
+    slope = sum((x - mean_x) * (y - mean_y) for x, y in zip(xs, ys)) / sxx
+    intercept = mean_y - slope * mean_x
+    residual = sum((y - (intercept + slope * x)) ** 2 for x, y in zip(xs, ys))
+    return slope, intercept, residual
+
+
+# fit t = a * n^k ('power') and t = a * b^n ('exponential') in log space to the last few points
+# and keep the one with the smaller residual, returns (kind, log a, k or log b)
+def fit_growth(sizes, times, points=5):
+    pts = [(n, max(t, 1e-9)) for n, t in zip(sizes, times) if n > 0][-points:]
+    if len(pts) < 2:
+        return None
+
+    best = None
+    for kind in ('power', 'exponential'):
+        xs = [math.log(n) if kind == 'power' else n for n, _ in pts]
+        ys = [math.log(t) for _, t in pts]
+        slope, intercept, residual = _least_squares(xs, ys)
+        if best is None or residual < best[3]:
+            best = (kind, intercept, slope, residual)
+    return best[:3]
+
+
+def predict_time(model, n):
+    kind, intercept, slope = model
+    x = math.log(n) if kind == 'power' else n
+    return math.exp(min(intercept + slope * x, 700))
+
+
+# predicted times for sizes past the measured range
+def extrapolate(sizes, times, targets):
+    model = fit_growth(sizes, times)
+    if model is None:
+        return [float('nan')] * len(targets)
+    return [predict_time(model, n) for n in targets]
+
+
+# measure(n) runs the algorithm once on size n and returns its time in seconds
+# budget is the total wall-clock time in seconds allowed for this sweep
+def adaptive_sweep(measure, start, budget, growth=2.0, max_size=None):
+    sizes, times = [], []
+    started = time.perf_counter()
+
+    def remaining():
+        return budget - (time.perf_counter() - started)
+
+    def run(n):
+        sizes.append(n)
+        times.append(measure(n))
+
+    run(start)
+    lo, hi = start, None
+
+    # geometric phase
+    while remaining() > 0:
+        n = max(lo + 1, int(math.ceil(lo * growth)))
+        if max_size is not None:
+            n = min(n, max_size)
+            if n <= lo:
+                break
+        model = fit_growth(sizes, times)
+        if model is not None and predict_time(model, n) > remaining():
+            hi = n
+            break
+        run(n)
+        lo = n
+
+    # bisection phase between the last size that fit and the first one predicted not to
+    if hi is not None:
+        while hi - lo > 1 and remaining() > 0:
+            mid = (lo + hi) // 2
+            if predict_time(fit_growth(sizes, times), mid) > remaining():
+                hi = mid
+                continue
+            run(mid)
+            lo = mid
+
+    return sizes, times
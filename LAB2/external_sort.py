@@ -0,0 +1,115 @@
+import heapq
+import itertools
+import os
+import tempfile
+import time
+import numpy as np
+from sort import sorting_algorithms, NUMPY_ENGINES
+# external merge sort for binary files of fixed-width integers that do not fit in memory
+# the input is read in chunks that fit the memory budget, each chunk is sorted with an engine from sort.py
+# and spilled to disk as a run, then all runs are memory mapped and k-way merged in blocks
+
+# default memory budget in bytes, for sorting one chunk and later for the merge
+DEFAULT_MEMORY_BUDGET = 64 * 1024 * 1024
+
+# working set per element beyond the chunk itself while it is sorted: the NumPy engines hold the uint64
+# offsets, the digits, the argsort index and the gathered copy, the Python engines a list of boxed ints,
+# their merge buffer and the copy back into an array
+NUMPY_ENGINE_BYTES_PER_ITEM = 28
+PYTHON_ENGINE_BYTES_PER_ITEM = 48
+
+# one Python int in a list: the pointer and the int object
+BOXED_INT_BYTES = 40
+
+
+# number of elements per chunk so that sorting it with engine stays within memory_budget
+def chunk_items_for(memory_budget, engine, dtype):
+    dtype = np.dtype(dtype)
+    if engine in NUMPY_ENGINES:
+        item_bytes = dtype.itemsize + NUMPY_ENGINE_BYTES_PER_ITEM
+    else:
+        item_bytes = 2 * dtype.itemsize + PYTHON_ENGINE_BYTES_PER_ITEM
+    return max(1, memory_budget // item_bytes)
+
+
+# split the input file into sorted run files, returns their paths
+def create_runs(input_path, run_dir, memory_budget=DEFAULT_MEMORY_BUDGET, engine="Radix Sort", dtype=np.int64):
+    dtype = np.dtype(dtype)
+    chunk_items = chunk_items_for(memory_budget, engine, dtype)
+    runs = []
+    with open(input_path, 'rb') as f:
+        while True:
+            chunk = np.fromfile(f, dtype=dtype, count=chunk_items)
+            if chunk.size == 0:
+                break
+            if engine in NUMPY_ENGINES:
+                sorting_algorithms[engine](chunk)
+            else:
+                values = chunk.tolist()
+                sorting_algorithms[engine](values)
+                chunk = np.array(values, dtype=dtype)
+                del values
+            run_path = os.path.join(run_dir, f"run_{len(runs):05d}.bin")
+            chunk.tofile(run_path)
+            runs.append(run_path)
+            # free the chunk before the next one is read, otherwise both are alive at once
+            del chunk
+    return runs
+
+
+# one memory mapped run, read block by block so only a block of every run is in memory at a time
+def _run_blocks(run_path, block_items, dtype):
+    mapped = np.memmap(run_path, dtype=dtype, mode='r')
+    for start in range(0, mapped.size, block_items):
+        yield from mapped[start:start + block_items].tolist()
+    del mapped
+
+
+# stream the merged runs as Python ints
+def merge_runs(runs, memory_budget=DEFAULT_MEMORY_BUDGET, dtype=np.int64):
+    dtype = np.dtype(dtype)
+    runs = [run for run in runs if os.path.getsize(run)]
+    if not runs:
+        return
+    # share the budget between the blocks of all runs, every block is held as a list of Python ints
+    block_items = max(1, memory_budget // (BOXED_INT_BYTES * len(runs)))
+    yield from heapq.merge(*[_run_blocks(run, block_items, dtype) for run in runs])
+
+
+# sort the binary file at input_path and yield its values in ascending order
+def external_sort(input_path, memory_budget=DEFAULT_MEMORY_BUDGET, engine="Radix Sort", dtype=np.int64,
+                  run_dir=None):
+    with tempfile.TemporaryDirectory(dir=run_dir) as tmp:
+        runs = create_runs(input_path, tmp, memory_budget, engine, dtype)
+        yield from merge_runs(runs, memory_budget, dtype)
+
+
+# sort input_path into output_path, writing the result in blocks
+def external_sort_to_file(input_path, output_path, memory_budget=DEFAULT_MEMORY_BUDGET, engine="Radix Sort",
+                          dtype=np.int64, run_dir=None):
+    dtype = np.dtype(dtype)
+    # during the merge a quarter of the budget buffers the output, the rest goes to the blocks of the runs
+    output_budget = memory_budget // 4
+    block_items = max(1, output_budget // dtype.itemsize)
+    with tempfile.TemporaryDirectory(dir=run_dir) as tmp, open(output_path, 'wb') as out:
+        runs = create_runs(input_path, tmp, memory_budget, engine, dtype)
+        merged = merge_runs(runs, memory_budget - output_budget, dtype)
+        remaining = os.path.getsize(input_path) // dtype.itemsize
+        while remaining:
+            # an exact count lets fromiter fill the block without growing it
+            count = min(block_items, remaining)
+            np.fromiter(itertools.islice(merged, count), dtype=dtype, count=count).tofile(out)
+            remaining -= count
+
+
+if __name__ == "__main__":
+    size = 10_000_000
+    with tempfile.TemporaryDirectory() as tmp:
+        input_path = os.path.join(tmp, "input.bin")
+        output_path = os.path.join(tmp, "output.bin")
+        np.random.randint(0, 10000, size).astype(np.int64).tofile(input_path)
+
+        for budget in [8 * 1024 * 1024, 32 * 1024 * 1024, 128 * 1024 * 1024]:
+            start_time = time.time()
+            external_sort_to_file(input_path, output_path, memory_budget=budget)
+            print(f"{size} values, budget {budget // (1024 * 1024)} MiB: {time.time() - start_time:.2f} sec")
@@ -0,0 +1,129 @@
+import os
+import time
+import matplotlib.pyplot as plt
+import numpy as np
+from concurrent.futures import ProcessPoolExecutor
+from multiprocessing import shared_memory
+from sort import sorting_algorithms, NUMPY_ENGINES
+# parallel chunked sort
+# the input is copied once into a shared memory buffer, every worker sorts its own slice of that buffer
+# with one of the engines from sort.py, and the sorted slices are merged pairwise straight out of that buffer
+
+
+# runs in a worker process: attach to the shared buffer and sort array[low:high] with the named engine
+def _sort_chunk(shm_name, size, dtype, low, high, engine):
+    shm = shared_memory.SharedMemory(name=shm_name)
+    try:
+        chunk = np.ndarray((size,), dtype=dtype, buffer=shm.buf)[low:high]
+        if engine in NUMPY_ENGINES:
+            sorting_algorithms[engine](chunk)
+        else:
+            values = chunk.tolist()
+            sorting_algorithms[engine](values)
+            chunk[:] = values
+        del chunk
+    finally:
+        shm.close()
+
+
+# one round of pairwise merging: the sorted runs src[bounds[r]:bounds[r + 1]] are merged two by two into dst
+# and the bounds of the merged runs are returned; an element's output position is its index in its own run
+# plus the number of elements of the other run before it, found for the whole run at once with searchsorted
+def _merge_round(src, dst, bounds):
+    merged_bounds = [bounds[0]]
+    for r in range(0, len(bounds) - 1, 2):
+        low, mid = bounds[r], bounds[r + 1]
+        if r + 2 < len(bounds):
+            high = bounds[r + 2]
+            a, b = src[low:mid], src[mid:high]
+            # on ties the left run goes first, which keeps the merge stable
+            dst[low + np.arange(a.size) + np.searchsorted(b, a, side='left')] = a
+            dst[low + np.arange(b.size) + np.searchsorted(a, b, side='right')] = b
+        else:
+            high = mid
+            dst[low:high] = src[low:high]
+        merged_bounds.append(high)
+    return merged_bounds
+
+
+# merge the sorted runs of array between bounds, ping-ponging between array and one scratch buffer
+# so the merge never holds more than two copies of the data; returns the array holding the result
+def merge_sorted_runs(array, bounds):
+    buffers = [array, np.empty_like(array)]
+    while len(bounds) > 2:
+        bounds = _merge_round(buffers[0], buffers[1], bounds)
+        buffers.reverse()
+    return buffers[0]
+
+
+# sort arr (list or 1-d NumPy array) in place using workers processes, one chunk per worker
+# dtype=None shares the data in its own dtype, an explicit dtype must hold every value without loss
+def parallel_sort(arr, workers=None, engine="Intro Sort", dtype=None):
+    workers = workers or os.cpu_count() or 1
+    size = len(arr)
+    if size < 2:
+        return
+
+    data = arr if isinstance(arr, np.ndarray) else np.asarray(arr)
+    if data.dtype.kind not in 'biuf':
+        raise ValueError(f"parallel sort needs numbers of one NumPy dtype, got {data.dtype}")
+    dtype = data.dtype if dtype is None else np.dtype(dtype)
+    if not np.can_cast(data.dtype, dtype, 'safe'):
+        raise ValueError(f"values of dtype {data.dtype} do not fit dtype {dtype}")
+
+    shm = shared_memory.SharedMemory(create=True, size=size * dtype.itemsize)
+    shared = merged = None
+    try:
+        shared = np.ndarray((size,), dtype=dtype, buffer=shm.buf)
+        shared[:] = data
+        del data
+
+        bounds = [size * w // workers for w in range(workers + 1)]
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            futures = [pool.submit(_sort_chunk, shm.name, size, dtype.str, bounds[w], bounds[w + 1], engine)
+                       for w in range(workers) if bounds[w] < bounds[w + 1]]
+            for future in futures:
+                future.result()
+
+        # the runs are read in place through the shared buffer, no per-chunk copies
+        merged = merge_sorted_runs(shared, bounds)
+        if isinstance(arr, np.ndarray):
+            arr[:] = merged
+        else:
+            arr[:] = merged.tolist()
+    finally:
+        # views of shm.buf must be gone before close(), otherwise it raises BufferError over the real error
+        shared = merged = None
+        shm.close()
+        shm.unlink()
+
+
+# time parallel_sort for every worker count up to max_workers and return (workers, times, speedups)
+def benchmark_parallel_sort(size=2_000_000, engine="Intro Sort", max_workers=None):
+    max_workers = max_workers or os.cpu_count() or 1
+    data = np.random.randint(0, 10000, size)
+    worker_counts = list(range(1, max_workers + 1))
+    times = []
+    for workers in worker_counts:
+        array = data.copy()
+        start_time = time.time()
+        parallel_sort(array, workers=workers, engine=engine)
+        times.append(time.time() - start_time)
+        print(f"{engine}, {workers} workers: {times[-1]:.3f} sec")
+    speedups = [times[0] / t for t in times]
+    return worker_counts, times, speedups
+
+
+if __name__ == "__main__":
+    for engine in ["Intro Sort", "Natural Merge Sort", "Radix Sort"]:
+        worker_counts, times, speedups = benchmark_parallel_sort(engine=engine)
+        plt.plot(worker_counts, speedups, marker='o', label=engine)
+
+    max_workers = os.cpu_count() or 1
+    plt.plot([1, max_workers], [1, max_workers], linestyle='--', color='gray', label="Linear speedup")
+    plt.xlabel("Worker Processes")
+    plt.ylabel("Speedup over 1 worker")
+    plt.title("Parallel Sort Speedup")
+    plt.legend()
+    plt.grid()
+    plt.show()
@@ -1,11 +1,61 @@
+import math
+import os
 import time
+import tracemalloc
+from bisect import bisect_left, bisect_right
 import matplotlib.pyplot as plt
 import random
 import sys
 import numpy as np
+from adaptive_sweep import adaptive_sweep, extrapolate
+from array import array as typed_array
 sys.setrecursionlimit(16000)
 
 
+# TYPED buffers
+# besides lists, the engines sort array.array, NumPy arrays and memoryviews in place without copying them
+
+# backends generate_arrays can produce
+BACKENDS = ["list", "array", "numpy", "memoryview"]
+
+
+# NumPy arrays are sorted through a memoryview of their memory, indexing it gives plain ints
+# instead of NumPy scalars and writes go straight into the array
+def as_buffer(arr):
+    if isinstance(arr, np.ndarray):
+        return memoryview(arr)
+    return arr
+
+
+# a copy of arr with the same type
+def copy_array(arr):
+    if isinstance(arr, memoryview):
+        return memoryview(bytearray(arr.tobytes())).cast(arr.format)
+    if isinstance(arr, typed_array):
+        return typed_array(arr.typecode, arr)
+    return arr.copy()
+
+
+def to_backend(values, backend):
+    if backend == "array":
+        return typed_array('q', values)
+    if backend == "numpy":
+        return np.array(values, dtype=np.int64)
+    if backend == "memoryview":
+        return memoryview(typed_array('q', values))
+    return list(values)
+
+
+# memory per element, a list also pays for every distinct int object it points to
+def bytes_per_element(arr):
+    if not len(arr):
+        return 0.0
+    if isinstance(arr, list):
+        objects = {id(v): v for v in arr}
+        return (sys.getsizeof(arr) + sum(sys.getsizeof(v) for v in objects.values())) / len(arr)
+    return arr.itemsize
+
+
 # QUICK sort with Lomuto partition
 
 # partition function
@@ -34,6 +84,7 @@ def swap(array, i, j):
 
 # The quick sort function implementation
 def quick_sort(array, low, high):
+    array = as_buffer(array)
     if low < high:
         # pi is the index of the pivot after partition
         pi = partition(array, low, high)
@@ -86,6 +137,7 @@ def merge(array, left, mid, right):
 
 
 def merge_sort(arr, left, right):
+    arr = as_buffer(arr)
     if left < right:
         mid = (left + right) // 2
 
@@ -94,54 +146,257 @@ def merge_sort(arr, left, right):
         merge(arr, left, mid, right)
 
 
+# NATURAL MERGE sort
+# bottom-up merge of the runs already present in the input, with one auxiliary buffer for the whole sort
+
+# runs shorter than this are extended with insertion sort before merging
+MIN_RUN = 32
+
+# after this many consecutive wins from one run, the rest of its winning block is found by binary search
+MIN_GALLOP = 7
+
+
+# merge src[lo..mid-1] and src[mid..hi-1] into dst[lo..hi-1]
+def merge_runs(src, dst, lo, mid, hi):
+    i, j, k = lo, mid, lo
+    left_wins = right_wins = 0
+
+    while i < mid and j < hi:
+        if src[j] < src[i]:
+            dst[k] = src[j]
+            j += 1
+            k += 1
+            left_wins, right_wins = 0, right_wins + 1
+            if right_wins >= MIN_GALLOP:
+                # copy every element of the right run smaller than src[i] at once
+                end = bisect_left(src, src[i], j, hi)
+                dst[k:k + end - j] = src[j:end]
+                k += end - j
+                j = end
+                right_wins = 0
+        else:
+            dst[k] = src[i]
+            i += 1
+            k += 1
+            left_wins, right_wins = left_wins + 1, 0
+            if left_wins >= MIN_GALLOP and j < hi:
+                # copy every element of the left run not greater than src[j] at once, keeps the sort stable
+                end = bisect_right(src, src[j], i, mid)
+                dst[k:k + end - i] = src[i:end]
+                k += end - i
+                i = end
+                left_wins = 0
+
+    # copy the rest of whichever run is left
+    dst[k:k + mid - i] = src[i:mid]
+    k += mid - i
+    dst[k:k + hi - j] = src[j:hi]
+
+
+def natural_merge_sort(arr):
+    arr = as_buffer(arr)
+    n = len(arr)
+    if n < 2:
+        return
+
+    # find the runs, reverse strictly descending ones and extend short ones to MIN_RUN
+    runs = [0]
+    i = 0
+    while i < n:
+        j = i + 1
+        if j < n and arr[j] < arr[i]:
+            while j < n and arr[j] < arr[j - 1]:
+                j += 1
+            arr[i:j] = arr[i:j][::-1]
+        else:
+            while j < n and arr[j] >= arr[j - 1]:
+                j += 1
+        if j - i < MIN_RUN and j < n:
+            j = min(i + MIN_RUN, n)
+            insertion_sort(arr, i, j - 1)
+        runs.append(j)
+        i = j
+
+    # merge neighbouring runs pass by pass, alternating between arr and the buffer
+    buffer = copy_array(arr)
+    src, dst = arr, buffer
+    while len(runs) > 2:
+        merged = [0]
+        for r in range(0, len(runs) - 1, 2):
+            lo = runs[r]
+            if r + 2 < len(runs):
+                hi = runs[r + 2]
+                if src[runs[r + 1] - 1] <= src[runs[r + 1]]:
+                    # the two runs are already in order
+                    dst[lo:hi] = src[lo:hi]
+                else:
+                    merge_runs(src, dst, lo, runs[r + 1], hi)
+            else:
+                hi = runs[r + 1]
+                dst[lo:hi] = src[lo:hi]
+            merged.append(hi)
+        runs = merged
+        src, dst = dst, src
+
+    if src is not arr:
+        arr[:] = src
+
+
 # HEAP sort
+# d-ary max heap, node i has children d*i + 1 .. d*i + d (d = 2 is the usual binary heap)
+
+# arity used by the 4-ary variant, fewer levels to walk per sift
+HEAP_ARITY = 4
+
 
 # function to heapify a subtree rooted with node i
-def heapify(arr, n, i):
-    # initialize largest as root
-    largest = i
+# the heap lives in arr[offset..offset+n-1]; the root value is moved down as a hole instead of swapping
+def heapify(arr, n, i, d=2, offset=0):
+    value = arr[offset + i]
+    while True:
+        first = d * i + 1
+        if first >= n:
+            break
 
-    #  left index = 2*i + 1
-    l = 2 * i + 1
+        # find the largest child
+        largest = first
+        for child in range(first + 1, min(first + d, n)):
+            if arr[offset + child] > arr[offset + largest]:
+                largest = child
 
-    # right index = 2*i + 2
-    r = 2 * i + 2
+        # stop once no child is larger than the value being sifted
+        if arr[offset + largest] <= value:
+            break
 
-    # if left child is larger than root
-    if l < n and arr[l] > arr[largest]:
-        largest = l
+        # move the child up into the hole
+        arr[offset + i] = arr[offset + largest]
+        i = largest
 
-    # If right child is larger than largest so far
-    if r < n and arr[r] > arr[largest]:
-        largest = r
+    arr[offset + i] = value
 
-    # if largest is not root
-    if largest != i:
-        arr[i], arr[largest] = arr[largest], arr[i]  # swap
 
-        # recursively heapify the affected sub-tree
-        heapify(arr, n, largest)
+# build heap (rearrange array)
+def build_heap(arr, n, d=2, offset=0):
+    for i in range((n - 2) // d, -1, -1):
+        heapify(arr, n, i, d, offset)
+
+
+# one by one move the root to the end of the shrinking heap, leaving arr[offset..offset+n-1] ascending
+def sort_heap(arr, n, d=2, offset=0):
+    for i in range(n - 1, 0, -1):
+        arr[offset], arr[offset + i] = arr[offset + i], arr[offset]
+        heapify(arr, i, 0, d, offset)
 
 
 # Main function to do heap sort
-def heap_sort(arr):
+def heap_sort(arr, d=2):
+    arr = as_buffer(arr)
     n = len(arr)
+    build_heap(arr, n, d)
+    sort_heap(arr, n, d)
 
-    # build heap (rearrange array)
-    for i in range(n // 2 - 1, -1, -1):
-        heapify(arr, n, i)
 
-    # one by one extract an element from heap
-    for i in range(n - 1, 0, -1):
-        # move root to end
-        arr[0], arr[i] = arr[i], arr[0]
+# smallest k elements of arr, ascending, in O(n log k) with a max heap of size k
+def top_k(arr, k, d=HEAP_ARITY):
+    k = max(0, min(k, len(arr)))
+    if k == 0:
+        return []
+    heap = list(arr[:k])
+    build_heap(heap, k, d)
+    for i in range(k, len(arr)):
+        # anything smaller than the largest kept element replaces it
+        if arr[i] < heap[0]:
+            heap[0] = arr[i]
+            heapify(heap, k, 0, d)
+    sort_heap(heap, k, d)
+    return heap
+
+
+# in place: arr[:k] becomes the smallest k elements in ascending order, the rest is left in any order
+def partial_sort(arr, k, d=HEAP_ARITY):
+    k = max(0, min(k, len(arr)))
+    if k == 0:
+        return
+    build_heap(arr, k, d)
+    for i in range(k, len(arr)):
+        if arr[i] < arr[0]:
+            arr[0], arr[i] = arr[i], arr[0]
+            heapify(arr, k, 0, d)
+    sort_heap(arr, k, d)
+
+
+# COUNTING and RADIX sort for integer keys, vectorized with NumPy
+# lists are sorted through a NumPy copy and written back, NumPy arrays are sorted in place
+
+# counting sort only allocates a histogram up to this many times the array length (or 2^16 buckets)
+COUNTING_SORT_RANGE_FACTOR = 4
+
+# largest digit width for one radix pass, 2^16 buckets
+MAX_RADIX_BITS = 16
+
+
+def _integer_keys(arr):
+    keys = np.asarray(arr)
+    if keys.size and not np.issubdtype(keys.dtype, np.integer):
+        raise ValueError("counting and radix sort need integer keys")
+    return keys
+
+
+def _write_back(arr, result):
+    if isinstance(arr, list):
+        arr[:] = result.tolist()
+    else:
+        np.asarray(arr)[...] = result
+
+
+def counting_sort(arr):
+    keys = _integer_keys(arr)
+    if keys.size < 2:
+        return
+    low, high = int(keys.min()), int(keys.max())
+
+    # a wide key range would make the histogram bigger than the data
+    if high - low + 1 > max(COUNTING_SORT_RANGE_FACTOR * keys.size, 1 << MAX_RADIX_BITS):
+        radix_sort(arr)
+        return
+
+    counts = np.bincount((keys.astype(np.int64) - low).astype(np.intp), minlength=high - low + 1)
+    _write_back(arr, np.repeat(np.arange(low, high + 1, dtype=keys.dtype), counts))
 
-        # call max heapify on the reduced heap
-        heapify(arr, i, 0)
+
+# LSD radix sort, the digit width is picked from the key range so the number of passes is minimal
+def radix_sort(arr):
+    keys = _integer_keys(arr)
+    if keys.size < 2:
+        return
+    low, high = int(keys.min()), int(keys.max())
+
+    # shift to non-negative offsets from the minimum
+    offsets = (keys.astype(np.int64) - low).astype(np.uint64) if low < 0 else (keys - low).astype(np.uint64)
+    key_bits = max(1, (high - low).bit_length())
+    passes = -(-key_bits // MAX_RADIX_BITS)
+    radix_bits = -(-key_bits // passes)
+    mask = np.uint64((1 << radix_bits) - 1)
+    # digits of at most 16 bits make NumPy's stable argsort a counting sort (O(n + 2^bits)) instead of
+    # the O(n log n) merge sort it falls back to for 64-bit integers
+    digit_dtype = np.uint8 if radix_bits <= 8 else np.uint16
+
+    for p in range(passes):
+        digits = ((offsets >> np.uint64(p * radix_bits)) & mask).astype(digit_dtype)
+        # skip passes where every key has the same digit
+        histogram = np.bincount(digits, minlength=1 << radix_bits)
+        if histogram.max() == keys.size:
+            continue
+        # stable scatter by digit
+        offsets = offsets[np.argsort(digits, kind='stable')]
+
+    restored = offsets.astype(np.int64) + low if low < 0 else offsets + np.uint64(low)
+    _write_back(arr, restored.astype(keys.dtype))
 
 
 # COCKTAIL sort
 def cocktail_sort(a):
+    a = as_buffer(a)
     n = len(a)
     swapped = True
     start = 0
@@ -177,8 +432,330 @@ def cocktail_sort(a):
         start = start + 1
 
 
-# generate arrays for testing
-def generate_arrays(size):
+# INTRO sort
+# quick sort with ninther / median-of-three pivots and three-way partitioning, an explicit stack instead of
+# recursion, insertion sort for small ranges and heap sort once the depth limit is reached
+
+# ranges of at most this many elements are finished with insertion sort
+INSERTION_SORT_CUTOFF = 16
+
+# ranges longer than this use the ninther (median of three medians of three) as pivot
+NINTHER_THRESHOLD = 40
+
+
+# insertion sort of array[low..high]
+def insertion_sort(array, low, high):
+    for i in range(low + 1, high + 1):
+        key = array[i]
+        j = i - 1
+        while j >= low and array[j] > key:
+            array[j + 1] = array[j]
+            j -= 1
+        array[j + 1] = key
+
+
+# index of the median of array[a], array[b], array[c]
+def median_of_three(array, a, b, c):
+    if array[a] < array[b]:
+        if array[b] < array[c]:
+            return b
+        return c if array[a] < array[c] else a
+    if array[a] < array[c]:
+        return a
+    return c if array[b] < array[c] else b
+
+
+def choose_pivot(array, low, high):
+    mid = (low + high) // 2
+    if high - low + 1 > NINTHER_THRESHOLD:
+        step = (high - low + 1) // 8
+        return median_of_three(array,
+                               median_of_three(array, low, low + step, low + 2 * step),
+                               median_of_three(array, mid - step, mid, mid + step),
+                               median_of_three(array, high - 2 * step, high - step, high))
+    return median_of_three(array, low, mid, high)
+
+
+# Dutch national flag partition of array[low..high] around the pivot value
+# returns (lt, gt) with array[low..lt-1] < pivot, array[lt..gt] == pivot and array[gt+1..high] > pivot
+def partition_three_way(array, low, high, pivot):
+    lt, i, gt = low, low, high
+    while i <= gt:
+        if array[i] < pivot:
+            array[lt], array[i] = array[i], array[lt]
+            lt += 1
+            i += 1
+        elif array[i] > pivot:
+            array[i], array[gt] = array[gt], array[i]
+            gt -= 1
+        else:
+            i += 1
+    return lt, gt
+
+
+# heap sort of array[low..high], used by intro sort as the fallback
+def heap_sort_range(array, low, high):
+    n = high - low + 1
+    build_heap(array, n, 2, low)
+    sort_heap(array, n, 2, low)
+
+
+def intro_sort(array, low, high):
+    array = as_buffer(array)
+    if high <= low:
+        return
+    stack = [(low, high, 2 * int(math.log2(high - low + 1)))]
+
+    while stack:
+        low, high, depth = stack.pop()
+        while high - low + 1 > INSERTION_SORT_CUTOFF:
+            if depth == 0:
+                heap_sort_range(array, low, high)
+                break
+            depth -= 1
+
+            lt, gt = partition_three_way(array, low, high, array[choose_pivot(array, low, high)])
+
+            # push the larger side and keep going on the smaller one, so the stack stays O(log n)
+            if lt - low < high - gt:
+                stack.append((gt + 1, high, depth))
+                high = lt - 1
+            else:
+                stack.append((low, lt - 1, depth))
+                low = gt + 1
+
+        if high - low + 1 <= INSERTION_SORT_CUTOFF:
+            insertion_sort(array, low, high)
+
+
+# SELECTION
+# k-th smallest elements with quickselect on partition(), switching to median of medians pivots with
+# three-way partitioning once the depth limit is reached so the worst case stays O(n)
+
+
+# value of the median of medians of array[low..high], reorders that range
+def median_of_medians(array, low, high):
+    if high - low + 1 <= 5:
+        insertion_sort(array, low, high)
+        return array[(low + high) // 2]
+
+    # move the median of every group of five to the front of the range
+    store = low
+    for group in range(low, high + 1, 5):
+        end = min(group + 4, high)
+        insertion_sort(array, group, end)
+        swap(array, store, (group + end) // 2)
+        store += 1
+
+    return array[select_linear(array, low, store - 1, (low + store - 1) // 2)]
+
+
+# guaranteed linear time selection, returns k once array[k] holds the k-th smallest of array[low..high]
+def select_linear(array, low, high, k):
+    while low < high:
+        lt, gt = partition_three_way(array, low, high, median_of_medians(array, low, high))
+        if k < lt:
+            high = lt - 1
+        elif k > gt:
+            low = gt + 1
+        else:
+            break
+    return k
+
+
+# in place: afterwards array[k] holds the k-th smallest value of array[low..high] for every k in ks,
+# and every range between two requested ranks is partitioned around them; returns the values in the order of ks
+def select_many(array, ks, low=0, high=None):
+    array = as_buffer(array)
+    high = len(array) - 1 if high is None else high
+    for k in ks:
+        if not low <= k <= high:
+            raise IndexError(f"rank {k} outside of [{low}, {high}]")
+
+    targets = sorted(set(ks))
+    if targets:
+        stack = [(low, high, targets, 2 * int(math.log2(high - low + 1)))]
+    else:
+        stack = []
+
+    while stack:
+        low, high, ranks, depth = stack.pop()
+        if high - low + 1 <= INSERTION_SORT_CUTOFF:
+            insertion_sort(array, low, high)
+            continue
+
+        if depth > 0:
+            # median of three moved to the end, where partition() takes its pivot from
+            swap(array, median_of_three(array, low, (low + high) // 2, high), high)
+            lt = gt = partition(array, low, high)
+        else:
+            lt, gt = partition_three_way(array, low, high, median_of_medians(array, low, high))
+
+        # only recurse into the sides that still contain a requested rank
+        left = [k for k in ranks if k < lt]
+        right = [k for k in ranks if k > gt]
+        if left:
+            stack.append((low, lt - 1, left, depth - 1))
+        if right:
+            stack.append((gt + 1, high, right, depth - 1))
+
+    return [array[k] for k in ks]
+
+
+# in place: array[k] becomes the k-th smallest value, smaller values before it and larger ones after it
+def nth_element(array, k, low=0, high=None):
+    return select_many(array, [k], low, high)[0]
+
+
+# k-th smallest value of arr (0-based), arr itself is left unchanged
+def select(arr, k):
+    return nth_element(copy_array(arr), k)
+
+
+# values at the given quantiles (0 <= q <= 1, nearest rank), arr itself is left unchanged
+def quantiles(arr, qs):
+    n = len(arr)
+    if n == 0:
+        raise IndexError("quantiles of an empty array")
+    return select_many(copy_array(arr), [int(round(q * (n - 1))) for q in qs])
+
+
+# ARGSORT
+# sort a permutation instead of the records themselves: keys are extracted once, every engine then moves
+# small (key, index) items and the records are rearranged at most once at the end
+# the index breaks ties, so the result is stable for every engine
+
+
+# permutation that sorts records by key (the record itself when key is None) using the named engine
+def argsort(records, engine="Intro Sort", key=None):
+    n = len(records)
+    keys = [key(record) for record in records] if key is not None else list(records)
+    if n == 0:
+        return []
+
+    if all(isinstance(k, (int, np.integer)) and not isinstance(k, bool) for k in keys):
+        # integer keys: pack key and index into one int, (key - low) * n + index
+        low, high = int(min(keys)), int(max(keys))
+        if engine not in NUMPY_ENGINES or (high - low + 1) * n < 2 ** 63:
+            packed = [(int(k) - low) * n + i for i, k in enumerate(keys)]
+            sorting_algorithms[engine](packed)
+            return [p % n for p in packed]
+
+    if engine in NUMPY_ENGINES:
+        raise ValueError(f"{engine} can only argsort integer keys with (max - min + 1) * n below 2^63")
+
+    pairs = list(zip(keys, range(n)))
+    sorting_algorithms[engine](pairs)
+    return [i for _, i in pairs]
+
+
+# rearrange records in one pass so that records[j] becomes the old records[perm[j]]
+def apply_permutation(records, perm):
+    records[:] = [records[i] for i in perm]
+
+
+# sort records by key through argsort, returns the permutation; with apply=False the records are not moved
+def sort_by_key(records, key, engine="Intro Sort", apply=True):
+    perm = argsort(records, engine, key)
+    if apply:
+        apply_permutation(records, perm)
+    return perm
+
+
+# ADAPTIVE sort
+# a cheap sample of the array decides which engine runs on it
+
+# number of positions the probe looks at
+PROBE_SAMPLE_SIZE = 256
+
+# below this fraction of sampled inversions the input is treated as nearly sorted and its runs are merged,
+# above one minus it as nearly reversed
+NEARLY_SORTED_INVERSIONS = 0.2
+
+# below this fraction of distinct sampled values integer input goes to counting sort
+FEW_UNIQUE_RATIO = 0.05
+
+
+# descent fraction over sampled neighbours, inversion fraction over sampled pairs,
+# distinct value ratio of the sample and whether the sampled keys are all integers
+def probe_presortedness(arr, sample_size=PROBE_SAMPLE_SIZE):
+    n = len(arr)
+    positions = sorted(random.randrange(n - 1) for _ in range(min(sample_size, n - 1)))
+
+    descents = sum(1 for i in positions if arr[i] > arr[i + 1])
+
+    inversions = 0
+    for _ in range(len(positions)):
+        i, j = random.randrange(n), random.randrange(n)
+        if i > j:
+            i, j = j, i
+        if arr[i] > arr[j]:
+            inversions += 1
+
+    sample = [arr[i] for i in positions]
+    return {
+        "descents": descents / len(positions),
+        "inversions": inversions / len(positions),
+        "distinct": len(set(sample)) / len(sample),
+        "integer": all(isinstance(v, (int, np.integer)) and not isinstance(v, bool) for v in sample)
+    }
+
+
+# pick an engine from the probe features, returns its name in sorting_algorithms
+def choose_engine(features):
+    # inversions rather than descents, equal neighbours hide descents when values repeat
+    if features["inversions"] > 1 - NEARLY_SORTED_INVERSIONS:
+        return "Reverse"
+    if features["inversions"] < NEARLY_SORTED_INVERSIONS:
+        return "Natural Merge Sort"
+    if features["integer"] and features["distinct"] < FEW_UNIQUE_RATIO:
+        return "Counting Sort"
+    return "Intro Sort"
+
+
+# sort arr in place with the engine picked by the probe, returns the decision and how long probe and sort took
+def adaptive_sort(arr):
+    start_time = time.perf_counter()
+    if len(arr) <= INSERTION_SORT_CUTOFF:
+        features, engine = None, "Insertion Sort"
+    else:
+        features = probe_presortedness(arr)
+        engine = choose_engine(features)
+    probe_time = time.perf_counter() - start_time
+
+    if engine == "Insertion Sort":
+        insertion_sort(arr, 0, len(arr) - 1)
+    elif engine == "Reverse":
+        # reversed input becomes a single run, natural merge sort then only has a few runs left to merge
+        if hasattr(arr, 'reverse'):
+            arr.reverse()
+        else:
+            arr[:] = copy_array(arr[::-1])
+        natural_merge_sort(arr)
+    else:
+        sorting_algorithms[engine](arr)
+
+    return {
+        "engine": engine,
+        "features": features,
+        "probe_time": probe_time,
+        "sort_time": time.perf_counter() - start_time - probe_time
+    }
+
+
+# print which engine every array type is routed to and how much of the total time the probe took
+def report_adaptive_dispatch(sizes=(1500, 15000, 150000)):
+    for size in sizes:
+        for array_type in ARRAY_TYPES:
+            array = load_dataset(array_type, size).tolist()
+            decision = adaptive_sort(array.copy())
+            total = decision["probe_time"] + decision["sort_time"]
+            print(f"{size:>7} {array_type:<14} -> {decision['engine']:<19} "
+                  f"probe {decision['probe_time'] * 1000:.3f} ms ({decision['probe_time'] / total:.1%} of total)")
+
+
+# generate arrays for testing, as lists or as one of the typed backends
+def generate_arrays(size, backend="list"):
     random_array = np.random.randint(0, 10000, size).tolist()
     sorted_array = sorted(random_array)
     reversed_array = sorted_array[::-1]
@@ -188,47 +765,268 @@ def generate_arrays(size):
         i, j = random.sample(range(size), 2)
         nearly_sorted_array[i], nearly_sorted_array[j] = nearly_sorted_array[j], nearly_sorted_array[i]
 
-    return {
+    arrays = {
         "Random": random_array,
         "Sorted": sorted_array,
         "Reversed": reversed_array,
         "Few Unique": few_unique_array,
         "Nearly Sorted": nearly_sorted_array
     }
+    if backend != "list":
+        arrays = {array_type: to_backend(values, backend) for array_type, values in arrays.items()}
+    return arrays
+
+
+# DATASET store
+# every (type, size, seed) array is generated once, saved as .npy and memory mapped back on later runs,
+# so all algorithms are timed on exactly the same data
+
+DATASET_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "datasets")
+
+ARRAY_TYPES = ["Random", "Sorted", "Reversed", "Few Unique", "Nearly Sorted"]
+
+
+def dataset_path(array_type, size, seed=0, cache_dir=DATASET_DIR):
+    name = array_type.lower().replace(" ", "_")
+    return os.path.join(cache_dir, f"{name}_{size}_{seed}.npy")
+
+
+# all five array types for one (size, seed), generated from a single seeded generator
+def generate_seeded_arrays(size, seed=0):
+    rng = np.random.default_rng([seed, size])
+    random_array = rng.integers(0, 10000, size, dtype=np.int64)
+    sorted_array = np.sort(random_array)
+    few_unique_array = rng.choice(np.array([100, 500, 1000, 5000], dtype=np.int64), size)
+    nearly_sorted_array = sorted_array.copy()
+    if size >= 2:
+        for i, j in rng.integers(0, size, (size // 10, 2)).tolist():  # some swaps
+            nearly_sorted_array[i], nearly_sorted_array[j] = nearly_sorted_array[j], nearly_sorted_array[i]
+
+    return {
+        "Random": random_array,
+        "Sorted": sorted_array,
+        "Reversed": sorted_array[::-1].copy(),
+        "Few Unique": few_unique_array,
+        "Nearly Sorted": nearly_sorted_array
+    }
+
+
+# read-only memory map of the fixture, generated and saved first if it is not on disk yet
+def load_dataset(array_type, size, seed=0, cache_dir=DATASET_DIR):
+    path = dataset_path(array_type, size, seed, cache_dir)
+    if not os.path.exists(path):
+        os.makedirs(cache_dir, exist_ok=True)
+        for name, values in generate_seeded_arrays(size, seed).items():
+            target = dataset_path(name, size, seed, cache_dir)
+            if not os.path.exists(target):
+                # write under a temporary name first so a crashed run never leaves half a fixture behind
+                tmp = target + ".tmp.npy"
+                np.save(tmp, values)
+                os.replace(tmp, target)
+    return np.load(path, mmap_mode='r')
 
 
 # measure time of execution function
 def measure_time(sort_function, array):
+    # copy outside of the timed region
+    array = copy_array(array)
     start_time = time.time()
     # if function is quick_sort or merge_sort, pass extra arguments
-    if sort_function in [quick_sort, merge_sort]:
-        sort_function(array.copy(), 0, len(array) - 1)
+    if sort_function in [quick_sort, merge_sort, intro_sort]:
+        sort_function(array, 0, len(array) - 1)
     else:
-        sort_function(array.copy())
+        sort_function(array)
 
     return time.time() - start_time
 
+
+# OPERATION counters
+# the engines themselves are not touched, counting mode runs them on a list whose elements count their
+# comparisons and whose writes count as moves, so there is no cost at all when counting is off
+
+
+# element wrapper, every comparison between two wrapped values is counted
+class Counted:
+    __slots__ = ("value", "counts")
+
+    def __init__(self, value, counts):
+        self.value = value
+        self.counts = counts
+
+    def __lt__(self, other):
+        self.counts["comparisons"] += 1
+        return self.value < other.value
+
+    def __le__(self, other):
+        self.counts["comparisons"] += 1
+        return self.value <= other.value
+
+    def __gt__(self, other):
+        self.counts["comparisons"] += 1
+        return self.value > other.value
+
+    def __ge__(self, other):
+        self.counts["comparisons"] += 1
+        return self.value >= other.value
+
+
+# list that counts every element written into it
+class CountingList(list):
+    def __init__(self, values, counts):
+        super().__init__(values)
+        self.counts = counts
+
+    def __setitem__(self, index, value):
+        if isinstance(index, slice):
+            value = list(value)
+            self.counts["moves"] += len(value)
+        else:
+            self.counts["moves"] += 1
+        super().__setitem__(index, value)
+
+
+# sort_function on a plain list copy of array with only tracemalloc running, returns the peak traced bytes
+def _aux_bytes(sort_function, array):
+    values = list(array)
+    tracemalloc.start()
+    try:
+        if sort_function in [quick_sort, merge_sort, intro_sort]:
+            sort_function(values, 0, len(values) - 1)
+        else:
+            sort_function(values)
+    finally:
+        peak = tracemalloc.get_traced_memory()[1]
+        tracemalloc.stop()
+    return peak
+
+
+# run sort_function on a copy of array in counting mode
+# returns comparisons, moves (element writes into the array being sorted), peak auxiliary memory in bytes
+# and the deepest recursion of any single function;
+# the memory comes from a second, uninstrumented run, so the profiler and the counters are not part of it
+def count_operations(sort_function, array):
+    counts = {"comparisons": 0, "moves": 0, "aux_bytes": 0, "recursion_depth": 0}
+    values = CountingList([Counted(v, counts) for v in array], counts)
+
+    # nesting of every function of this file while the sort runs
+    nesting = {}
+
+    def profile(frame, event, arg):
+        if frame.f_code.co_filename != __file__:
+            return
+        if event == "call":
+            nesting[frame.f_code] = nesting.get(frame.f_code, 0) + 1
+            counts["recursion_depth"] = max(counts["recursion_depth"], nesting[frame.f_code])
+        elif event == "return":
+            nesting[frame.f_code] -= 1
+
+    sys.setprofile(profile)
+    try:
+        if sort_function in [quick_sort, merge_sort, intro_sort]:
+            sort_function(values, 0, len(values) - 1)
+        else:
+            sort_function(values)
+    finally:
+        sys.setprofile(None)
+
+    counts["aux_bytes"] = _aux_bytes(sort_function, array)
+    return counts
+
+
+# comparisons and moves against n for every comparison engine, next to the timings and the n log n / n^2 curves
+def plot_operation_counts(sizes=(250, 500, 1000, 2000, 4000), array_type="Random"):
+    engines = [name for name in sorting_algorithms if name not in NUMPY_ENGINES and name != "Adaptive Sort"]
+    arrays = {size: load_dataset(array_type, size).tolist() for size in sizes}
+
+    for sort_name in engines:
+        sort_func = sorting_algorithms[sort_name]
+        counts = [count_operations(sort_func, arrays[size]) for size in sizes]
+        times = [measure_time(sort_func, arrays[size]) for size in sizes]
+
+        plt.figure(figsize=(14, 5))
+        plt.subplot(1, 2, 1)
+        plt.plot(sizes, [c["comparisons"] for c in counts], marker='o', label="comparisons")
+        plt.plot(sizes, [c["moves"] for c in counts], marker='x', label="moves")
+        plt.plot(sizes, [n * math.log2(n) for n in sizes], linestyle='--', color='gray', label="n log n")
+        plt.plot(sizes, [n * n / 4 for n in sizes], linestyle=':', color='gray', label="n^2 / 4")
+        plt.xscale('log')
+        plt.yscale('log')
+        plt.xlabel("Array Size")
+        plt.ylabel("Operations")
+        plt.title(f"{sort_name} Operation Counts ({array_type})")
+        plt.legend()
+        plt.grid()
+
+        plt.subplot(1, 2, 2)
+        plt.plot(sizes, times, marker='o', color='purple')
+        plt.xlabel("Array Size")
+        plt.ylabel("Execution Time (seconds)")
+        plt.title(f"{sort_name} Execution Time ({array_type})")
+        plt.grid()
+        plt.tight_layout()
+        plt.show()
+
+        for size, c in zip(sizes, counts):
+            print(f"{sort_name:<20}{size:>7}  comparisons {c['comparisons']:>10}  moves {c['moves']:>10}  "
+                  f"aux {c['aux_bytes']:>9} B  recursion depth {c['recursion_depth']}")
+
+
+# every engine as a function of the whole array, sorted in place
+sorting_algorithms = {
+    "Quick Sort": lambda arr: quick_sort(arr, 0, len(arr) - 1),
+    "Intro Sort": lambda arr: intro_sort(arr, 0, len(arr) - 1),
+    "Merge Sort": lambda arr: merge_sort(arr, 0, len(arr) - 1),
+    "Natural Merge Sort": natural_merge_sort,
+    "Heap Sort": heap_sort,
+    "4-ary Heap Sort": lambda arr: heap_sort(arr, HEAP_ARITY),
+    "Cocktail Sort": cocktail_sort,
+    "Counting Sort": counting_sort,
+    "Radix Sort": radix_sort,
+    "Adaptive Sort": adaptive_sort
+}
+
+# engines that sort a NumPy array in place without converting it to a list first
+NUMPY_ENGINES = {"Counting Sort", "Radix Sort"}
+
+
+# time the four classic engines on every backend and print the memory per element next to the times
+def report_backends(size=5000, array_type="Random"):
+    engines = ["Quick Sort", "Merge Sort", "Heap Sort", "Cocktail Sort"]
+    values = load_dataset(array_type, size).tolist()
+    print(f"{'backend':<12}{'bytes/elem':>12}" + "".join(f"{name:>15}" for name in engines))
+    for backend in BACKENDS:
+        array = to_backend(values, backend)
+        times = [measure_time(sorting_algorithms[name], array) for name in engines]
+        print(f"{backend:<12}{bytes_per_element(array):>12.1f}" + "".join(f"{t:>14.4f}s" for t in times))
+
+
 # plot each sorting method function
-def plot_sorting_times():
+# algorithms named in sweep_budgets are swept from the smallest size until their budget (seconds per array type)
+# runs out instead of using the fixed sizes, and the rest of the curve is extrapolated
+def plot_sorting_times(sweep_budgets=None):
+    sweep_budgets = sweep_budgets or {}
     sizes = [500, 1500, 5000, 10000, 15000]  # Updated sizes
-    sorting_algorithms = {
-        "Quick Sort": lambda arr: quick_sort(arr, 0, len(arr) - 1),
-        "Merge Sort": lambda arr: merge_sort(arr, 0, len(arr) - 1),
-        "Heap Sort": heap_sort,
-        "Cocktail Sort": cocktail_sort
-    }
 
     colors = ["blue", "red", "green", "orange", "purple"]
-    array_types = ["Random", "Sorted", "Reversed", "Few Unique", "Nearly Sorted"]
 
     for sort_name, sort_func in sorting_algorithms.items():
         plt.figure(figsize=(10, 6))
 
-        for array_type, color in zip(array_types, colors):
+        for array_type, color in zip(ARRAY_TYPES, colors):
+            if sort_name in sweep_budgets:
+                run_sizes, times = adaptive_sweep(
+                    lambda size: measure_time(sort_func, load_dataset(array_type, size).tolist()),
+                    sizes[0], sweep_budgets[sort_name])
+                plt.plot(run_sizes, times, marker='o', linestyle='-', color=color, label=array_type)
+                rest = [size for size in sizes if size > run_sizes[-1]]
+                if rest:
+                    plt.plot([run_sizes[-1]] + rest, [times[-1]] + extrapolate(run_sizes, times, rest),
+                             linestyle='--', color=color)
+                continue
+
             times = []
             for size in sizes:
-                test_arrays = generate_arrays(size)
-                time_taken = measure_time(sort_func, test_arrays[array_type])
+                time_taken = measure_time(sort_func, load_dataset(array_type, size).tolist())
                 times.append(time_taken)
             plt.plot(sizes, times, marker='o', linestyle='-', color=color, label=array_type)
 
@@ -240,4 +1038,8 @@ def plot_sorting_times():
         plt.show()
 
 
-plot_sorting_times()
+if __name__ == "__main__":
+    report_backends()
+    report_adaptive_dispatch()
+    plot_operation_counts()
+    plot_sorting_times(sweep_budgets={"Cocktail Sort": 10.0})
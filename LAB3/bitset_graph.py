@@ -0,0 +1,103 @@
+import numpy as np
+from generate_graphs import BLOCK_CELLS
+# bitset adjacency matrix
+# row u is a packed bit vector of ceil(n / 64) 64-bit words where bit v is set when u -> v is an edge,
+# one bit per vertex pair instead of a Python int per edge, so complete and dense graphs take n^2 / 8 bytes
+# and whole sets of vertices are combined a word at a time
+
+WORD_BITS = 64
+
+
+def words_for(n):
+    return -(-n // WORD_BITS)
+
+
+# vertex numbers of the set bits of a packed bit vector, in ascending order
+def bit_positions(bits):
+    return np.flatnonzero(np.unpackbits(bits.view(np.uint8), bitorder='little'))
+
+
+# rows of a (rows, n) boolean mask packed into (rows, words) 64-bit words
+def _pack_rows(mask, words):
+    packed = np.zeros((mask.shape[0], words * 8), dtype=np.uint8)
+    packed[:, :-(-mask.shape[1] // 8)] = np.packbits(mask, axis=1, bitorder='little')
+    return packed.view('<u8')
+
+
+class BitsetGraph:
+    def __init__(self, n, rows):
+        self.n = n
+        self.rows = rows
+        # a 2-D memoryview reads single words as plain ints
+        self._rows = memoryview(rows)
+
+    # build from parallel arrays of arcs u -> v
+    @classmethod
+    def from_edges(cls, n, src, dst):
+        src = np.asarray(src, dtype=np.int64)
+        dst = np.asarray(dst, dtype=np.int64)
+        words = words_for(n)
+        rows = np.zeros((n, words * 8), dtype=np.uint8)
+        np.bitwise_or.at(rows, (src, dst >> 3), (1 << (dst & 7)).astype(np.uint8))
+        return cls(n, rows.view('<u8'))
+
+    # build from a list of neighbour lists (or {neighbour: weight} dicts, the weights are dropped)
+    @classmethod
+    def from_adjacency(cls, adj):
+        n = len(adj)
+        degrees = np.fromiter((len(row) for row in adj), dtype=np.int64, count=n)
+        src = np.repeat(np.arange(n, dtype=np.int64), degrees)
+        dst = np.fromiter((v for row in adj for v in row), dtype=np.int64, count=int(degrees.sum()))
+        return cls.from_edges(n, src, dst)
+
+    # rows packed a block at a time from block_mask(start, end), a (end - start, n) boolean block,
+    # so the edges never exist as an edge list; the diagonal is cleared
+    @classmethod
+    def _from_row_blocks(cls, n, block_mask):
+        rows = np.zeros((n, words_for(n)), dtype='<u8')
+        rows_per_block = max(1, BLOCK_CELLS // max(n, 1))
+        for start in range(0, n, rows_per_block):
+            end = min(start + rows_per_block, n)
+            mask = block_mask(start, end)
+            mask[np.arange(end - start), np.arange(start, end)] = False
+            rows[start:end] = _pack_rows(mask, rows.shape[1])
+        return cls(n, rows)
+
+    # complete graph, the same edges as generate_complete_graph(n)
+    @classmethod
+    def complete(cls, n):
+        return cls._from_row_blocks(n, lambda start, end: np.ones((end - start, n), dtype=bool))
+
+    # every ordered pair u != v is an arc with probability p, like generate_dense_graph(n)
+    @classmethod
+    def bernoulli(cls, n, p=0.8, seed=None):
+        rng = np.random.default_rng(seed)
+        return cls._from_row_blocks(n, lambda start, end: rng.random((end - start, n)) < p)
+
+    def __len__(self):
+        return self.n
+
+    # neighbours in ascending order, so the graph also works where an adjacency list is expected
+    def __getitem__(self, u):
+        return self.neighbors(u)
+
+    def neighbors(self, u):
+        return bit_positions(self.rows[u]).tolist()
+
+    def has_edge(self, u, v):
+        return (self._rows[u, v >> 6] >> (v & 63)) & 1 == 1
+
+    def num_edges(self):
+        return int(np.unpackbits(self.rows.view(np.uint8)).sum())
+
+    # OR of the rows of the given vertices: every vertex reachable from them in one step
+    def union_of_rows(self, vertices, block_rows=None):
+        words = self.rows.shape[1]
+        block_rows = block_rows or max(1, BLOCK_CELLS // 64 // max(words, 1))
+        reach = np.zeros(words, dtype='<u8')
+        for start in range(0, len(vertices), block_rows):
+            reach |= np.bitwise_or.reduce(self.rows[vertices[start:start + block_rows]], axis=0)
+        return reach
+
+    def nbytes(self):
+        return self.rows.nbytes
@@ -0,0 +1,177 @@
+import os
+import sys
+import numpy as np
+from edge_stream import (
+    read_edge_batches, read_edge_file_header, DEFAULT_BATCH_EDGES, WEIGHTED, UNDIRECTED, FLOAT_WEIGHTS
+)
+# compressed sparse row graph
+# the neighbours of u are indices[indptr[u]:indptr[u + 1]] with matching weights, three flat arrays
+# instead of one Python list or dict per vertex; the BFS/DFS, shortest path and MST code accept it directly
+
+
+class CSRGraph:
+    def __init__(self, indptr, indices, weights=None):
+        self.indptr = indptr
+        self.indices = indices
+        self.weights = weights
+        # memoryviews index as plain ints without copying the arrays
+        self._indptr = memoryview(indptr)
+        self._indices = memoryview(indices)
+        self._weights = memoryview(weights) if weights is not None else None
+
+    # build from parallel arrays of arcs u -> v, neighbours of every vertex in ascending order
+    @classmethod
+    def from_edges(cls, n, src, dst, weights=None):
+        src = np.asarray(src, dtype=np.int64)
+        dst = np.asarray(dst, dtype=np.int64)
+        order = np.argsort(src * max(n, 1) + dst, kind='stable')
+        indptr = np.zeros(n + 1, dtype=np.int64)
+        np.cumsum(np.bincount(src, minlength=n), out=indptr[1:])
+        index_dtype = np.int32 if n < 2 ** 31 else np.int64
+        indices = np.ascontiguousarray(dst[order], dtype=index_dtype)
+        if weights is not None:
+            weights = np.asarray(weights)
+            if not np.issubdtype(weights.dtype, np.integer):
+                weight_dtype = np.float64
+            elif weights.size == 0 or np.abs(weights).max() < 2 ** 31:
+                weight_dtype = np.int32
+            else:
+                weight_dtype = np.int64
+            weights = np.ascontiguousarray(weights[order], dtype=weight_dtype)
+        return cls(indptr, indices, weights)
+
+    # build from the adjacency formats of the labs: a list of neighbour lists or a list of {neighbour: weight}
+    @classmethod
+    def from_adjacency(cls, adj):
+        n = len(adj)
+        degrees = np.fromiter((len(row) for row in adj), dtype=np.int64, count=n)
+        src = np.repeat(np.arange(n, dtype=np.int64), degrees)
+        m = int(degrees.sum())
+        weighted = any(isinstance(row, dict) for row in adj)
+        dst = np.fromiter((v for row in adj for v in row), dtype=np.int64, count=m)
+        weights = None
+        if weighted:
+            weights = np.array([w for row in adj for w in row.values()])
+        return cls.from_edges(n, src, dst, weights)
+
+    # build from one of the generators in generate_graphs.py, optionally through a weighting function
+    @classmethod
+    def from_generator(cls, generator, n, add_weights=None):
+        adj = generator(n)
+        if add_weights is not None:
+            adj = add_weights(adj)
+        return cls.from_adjacency(adj)
+
+    # build from an edge file written by edge_stream.py in two passes over its batches, degrees first and
+    # then a scatter into the rows; with out_dir the arrays are .npy memory maps there, so memory stays O(n + batch)
+    @classmethod
+    def from_edge_file(cls, path, out_dir=None, batch_edges=DEFAULT_BATCH_EDGES):
+        n, flags = read_edge_file_header(path)
+
+        def arcs(batch):
+            src, dst, weights = batch
+            if flags & UNDIRECTED:
+                src, dst = np.concatenate((src, dst)), np.concatenate((dst, src))
+                if weights is not None:
+                    weights = np.concatenate((weights, weights))
+            return src, dst, weights
+
+        # pass 1: degrees
+        degrees = np.zeros(n, dtype=np.int64)
+        for batch in read_edge_batches(path, batch_edges):
+            src = arcs(batch)[0]
+            vertices, counts = np.unique(src, return_counts=True)
+            degrees[vertices] += counts
+        indptr = np.zeros(n + 1, dtype=np.int64)
+        np.cumsum(degrees, out=indptr[1:])
+        m = int(indptr[-1])
+
+        def allocate(name, dtype):
+            if out_dir is None:
+                return np.empty(m, dtype=dtype)
+            return np.lib.format.open_memmap(os.path.join(out_dir, name), mode='w+', dtype=dtype, shape=(m,))
+
+        index_dtype = np.int32 if n < 2 ** 31 else np.int64
+        indices = allocate("indices.npy", index_dtype)
+        weights = None
+        if flags & WEIGHTED:
+            weights = allocate("weights.npy", np.float64 if flags & FLOAT_WEIGHTS else np.int32)
+
+        # pass 2: every arc goes to the next free slot of its row
+        cursor = indptr[:-1].copy()
+        for batch in read_edge_batches(path, batch_edges):
+            src, dst, w = arcs(batch)
+            order = np.argsort(src, kind='stable')
+            src = src[order]
+            vertices, first, counts = np.unique(src, return_index=True, return_counts=True)
+            rank = np.arange(src.size) - np.repeat(first, counts)
+            positions = cursor[src] + rank
+            indices[positions] = dst[order]
+            if weights is not None:
+                weights[positions] = w[order]
+            cursor[vertices] += counts
+
+        if out_dir is not None:
+            np.save(os.path.join(out_dir, "indptr.npy"), indptr)
+            indices.flush()
+            if weights is not None:
+                weights.flush()
+        return cls(indptr, indices, weights)
+
+    def __len__(self):
+        return len(self.indptr) - 1
+
+    def num_edges(self):
+        return len(self.indices)
+
+    def neighbors(self, u):
+        return self._indices[self._indptr[u]:self._indptr[u + 1]]
+
+    # (neighbour, weight) pairs of u, weight 1 when the graph is unweighted
+    def weighted_neighbors(self, u):
+        start, end = self._indptr[u], self._indptr[u + 1]
+        if self._weights is None:
+            return ((v, 1) for v in self._indices[start:end])
+        return zip(self._indices[start:end], self._weights[start:end])
+
+    def nbytes(self):
+        total = self.indptr.nbytes + self.indices.nbytes
+        if self.weights is not None:
+            total += self.weights.nbytes
+        return total
+
+
+# neighbours of u as a function, for adjacency lists and for graph types with a neighbors method
+# (CSR graphs, implicit grids)
+def neighbor_function(adj):
+    if hasattr(adj, "neighbors"):
+        return adj.neighbors
+    return adj.__getitem__
+
+
+# (neighbour, weight) pairs of u as a function, for lists of {neighbour: weight} and for graph types with a
+# weighted_neighbors method
+def edge_function(adj):
+    if hasattr(adj, "weighted_neighbors"):
+        return adj.weighted_neighbors
+    return lambda u: adj[u].items()
+
+
+# bytes per stored edge, a list or dict adjacency also pays for its containers and every distinct int object
+def memory_per_edge(adj):
+    if hasattr(adj, "nbytes"):
+        return adj.nbytes() / max(adj.num_edges(), 1)
+
+    total = sys.getsizeof(adj)
+    objects = {}
+    edges = 0
+    for row in adj:
+        total += sys.getsizeof(row)
+        edges += len(row)
+        values = row.items() if isinstance(row, dict) else ((v, None) for v in row)
+        for v, w in values:
+            objects[id(v)] = v
+            if w is not None:
+                objects[id(w)] = w
+    total += sum(sys.getsizeof(obj) for obj in objects.values())
+    return total / max(edges, 1)
@@ -0,0 +1,193 @@
+import math
+import numpy as np
+# streaming edge-list generation
+# every family yields its edges in batches of NumPy arrays that go straight to a binary edge file,
+# so no adjacency is built in memory; CSRGraph.from_edge_file turns the file into CSR in bounded memory
+
+# edge file: a 16 byte header followed by fixed-size little-endian edge records
+EDGE_FILE_MAGIC = b'EDG1'
+EDGE_FILE_HEADER = np.dtype([('magic', 'S4'), ('flags', '<u4'), ('n', '<u8')])
+EDGE_RECORD = np.dtype([('u', '<u4'), ('v', '<u4')])
+WEIGHTED_EDGE_RECORD = np.dtype([('u', '<u4'), ('v', '<u4'), ('w', '<i4')])
+FLOAT_WEIGHTED_EDGE_RECORD = np.dtype([('u', '<u4'), ('v', '<u4'), ('w', '<f8')])
+
+# header flags
+WEIGHTED = 1
+# every record stands for both u -> v and v -> u
+UNDIRECTED = 2
+# weights are 64-bit floats instead of 32-bit ints
+FLOAT_WEIGHTS = 4
+
+# edges per yielded batch
+DEFAULT_BATCH_EDGES = 1 << 20
+
+
+# record dtype for the header flags
+def edge_record(flags):
+    if not flags & WEIGHTED:
+        return EDGE_RECORD
+    return FLOAT_WEIGHTED_EDGE_RECORD if flags & FLOAT_WEIGHTS else WEIGHTED_EDGE_RECORD
+
+
+# write the batches of (src, dst) or (src, dst, weights) arrays to path, returns the number of records
+# with n=None the vertex count is the largest endpoint + 1, patched into the header at the end
+def write_edge_file(path, n, batches, flags=0):
+    record = edge_record(flags)
+    count = 0
+    max_vertex = -1
+    with open(path, 'wb') as f:
+        np.array([(EDGE_FILE_MAGIC, flags, n or 0)], dtype=EDGE_FILE_HEADER).tofile(f)
+        for batch in batches:
+            if n is None and len(batch[0]):
+                max_vertex = max(max_vertex, int(np.max(batch[0])), int(np.max(batch[1])))
+            out = np.empty(len(batch[0]), dtype=record)
+            out['u'] = batch[0]
+            out['v'] = batch[1]
+            if flags & WEIGHTED:
+                out['w'] = batch[2]
+            out.tofile(f)
+            count += out.size
+        if n is None:
+            f.seek(0)
+            np.array([(EDGE_FILE_MAGIC, flags, max_vertex + 1)], dtype=EDGE_FILE_HEADER).tofile(f)
+    return count
+
+
+# (n, flags) from the header of an edge file
+def read_edge_file_header(path):
+    header = np.fromfile(path, dtype=EDGE_FILE_HEADER, count=1)
+    if header.size != 1 or header['magic'][0] != EDGE_FILE_MAGIC:
+        raise ValueError(f"{path} is not an edge file")
+    return int(header['n'][0]), int(header['flags'][0])
+
+
+# memory mapped records of an edge file read batch by batch, yields (src, dst, weights or None)
+def read_edge_batches(path, batch_edges=DEFAULT_BATCH_EDGES):
+    n, flags = read_edge_file_header(path)
+    record = edge_record(flags)
+    records = np.memmap(path, dtype=record, mode='r', offset=EDGE_FILE_HEADER.itemsize)
+    for start in range(0, records.size, batch_edges):
+        batch = records[start:start + batch_edges]
+        weights = np.array(batch['w']) if flags & WEIGHTED else None
+        yield np.array(batch['u'], dtype=np.int64), np.array(batch['v'], dtype=np.int64), weights
+    del records
+
+
+# edge families, each one yields (src, dst) batches and mirrors a generator in generate_graphs.py
+
+# complete graph, every pair u < v once
+def stream_complete_edges(n, batch_edges=DEFAULT_BATCH_EDGES, seed=None):
+    u = 0
+    while u < n - 1:
+        # as many whole rows as fit in one batch, at least one
+        rows = []
+        size = 0
+        while u < n - 1 and (not rows or size + n - 1 - u <= batch_edges):
+            rows.append(u)
+            size += n - 1 - u
+            u += 1
+        src = np.repeat(np.array(rows, dtype=np.int64), [n - 1 - r for r in rows])
+        dst = np.concatenate([np.arange(r + 1, n, dtype=np.int64) for r in rows])
+        yield src, dst
+
+
+# random spanning tree plus about n / 2 extra edges, extra edges are only deduplicated within a batch
+def stream_sparse_edges(n, batch_edges=DEFAULT_BATCH_EDGES, seed=None):
+    rng = np.random.default_rng(seed)
+    for start in range(1, n, batch_edges):
+        children = np.arange(start, min(start + batch_edges, n), dtype=np.int64)
+        yield (rng.random(children.size) * children).astype(np.int64), children
+
+    remaining = n // 2
+    while remaining > 0:
+        count = min(remaining, batch_edges)
+        remaining -= count
+        u = rng.integers(0, n, count)
+        v = rng.integers(0, n, count)
+        keep = u != v
+        u, v = u[keep], v[keep]
+        _, first = np.unique(np.minimum(u, v) * n + np.maximum(u, v), return_index=True)
+        yield u[first], v[first]
+
+
+# binary tree, parent of i is (i - 1) // 2
+def stream_tree_edges(n, batch_edges=DEFAULT_BATCH_EDGES, seed=None):
+    for start in range(1, n, batch_edges):
+        children = np.arange(start, min(start + batch_edges, n), dtype=np.int64)
+        yield (children - 1) // 2, children
+
+
+# grid with int(sqrt(n)) rows, right and down neighbours, cells past n are left out
+def stream_grid_edges(n, batch_edges=DEFAULT_BATCH_EDGES, seed=None):
+    if n == 0:
+        return
+    rows = int(math.sqrt(n))
+    cols = int(math.ceil(n / rows))
+    rows_per_batch = max(1, batch_edges // (2 * cols))
+    for r0 in range(0, rows, rows_per_batch):
+        nodes = np.arange(r0 * cols, min((r0 + rows_per_batch) * cols, rows * cols), dtype=np.int64)
+        nodes = nodes[nodes < n]
+        right = nodes[(nodes % cols + 1 < cols) & (nodes + 1 < n)]
+        down = nodes[(nodes // cols + 1 < rows) & (nodes + cols < n)]
+        yield np.concatenate((right, down)), np.concatenate((right + 1, down + cols))
+
+
+# directed cycle i -> i + 1 plus about n / 2 random extra edges in both directions
+def stream_cyclic_edges(n, batch_edges=DEFAULT_BATCH_EDGES, seed=None):
+    rng = np.random.default_rng(seed)
+    for start in range(0, n, batch_edges):
+        nodes = np.arange(start, min(start + batch_edges, n), dtype=np.int64)
+        yield nodes, (nodes + 1) % n
+
+    remaining = n // 2
+    while remaining > 0 and n > 1:
+        count = min(remaining, batch_edges // 2)
+        remaining -= count
+        u = rng.integers(0, n, count)
+        v = rng.integers(0, n, count)
+        keep = u != v
+        u, v = u[keep], v[keep]
+        yield np.concatenate((u, v)), np.concatenate((v, u))
+
+
+# about sqrt(n) random trees over consecutive ranges of vertices
+def stream_disconnected_edges(n, batch_edges=DEFAULT_BATCH_EDGES, seed=None):
+    rng = np.random.default_rng(seed)
+    num_components = max(2, int(n ** 0.5))
+    nodes_per_component = n // num_components
+    for c in range(num_components):
+        start = c * nodes_per_component
+        end = (c + 1) * nodes_per_component if c < num_components - 1 else n
+        for chunk in range(start + 1, end, batch_edges):
+            children = np.arange(chunk, min(chunk + batch_edges, end), dtype=np.int64)
+            yield start + (rng.random(children.size) * (children - start)).astype(np.int64), children
+
+
+# every pair u < v with probability edge_probability, weights 1..10, drawn over blocks of rows
+def stream_weighted_edges(n, batch_edges=DEFAULT_BATCH_EDGES, seed=None, edge_probability=0.3):
+    rng = np.random.default_rng(seed)
+    rows_per_block = max(1, int(batch_edges / max(edge_probability * n, 1)))
+    for start in range(0, n, rows_per_block):
+        end = min(start + rows_per_block, n)
+        mask = rng.random((end - start, n)) < edge_probability
+        mask &= np.arange(n)[None, :] > np.arange(start, end)[:, None]
+        r, c = np.nonzero(mask)
+        yield r.astype(np.int64) + start, c.astype(np.int64), rng.integers(1, 11, r.size)
+
+
+# family name -> (stream function, header flags)
+edge_stream_families = {
+    "Complete": (stream_complete_edges, UNDIRECTED),
+    "Sparse": (stream_sparse_edges, UNDIRECTED),
+    "Tree": (stream_tree_edges, UNDIRECTED),
+    "Grid": (stream_grid_edges, UNDIRECTED),
+    "Cyclic": (stream_cyclic_edges, 0),
+    "Disconnected": (stream_disconnected_edges, UNDIRECTED),
+    "Weighted": (stream_weighted_edges, UNDIRECTED | WEIGHTED)
+}
+
+
+# write the named family with n vertices to path, returns the number of records written
+def generate_edge_file(family, n, path, batch_edges=DEFAULT_BATCH_EDGES, seed=None):
+    stream, flags = edge_stream_families[family]
+    return write_edge_file(path, n, stream(n, batch_edges, seed), flags)
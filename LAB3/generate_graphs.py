@@ -1,47 +1,132 @@
-import random
 import math
+import numpy as np
 # graph generation functions
-# generate a complete graph with n nodes.
+# random edges are drawn with NumPy: Bernoulli masks over blocks of rows for dense graphs, geometric skips
+# over the pair index for sparse G(n, p), and duplicate edges are removed through packed 64-bit edge keys
+
+# number of vertex pairs drawn at once by the block-wise Bernoulli masks
+BLOCK_CELLS = 1 << 22
+
+# below this edge probability pairs are drawn by geometric skip sampling instead of masks
+SKIP_SAMPLING_THRESHOLD = 0.05
+
+
+# adjacency lists from parallel arrays of edge endpoints, neighbours in ascending order
+def _adjacency_from_edges(n, src, dst):
+    order = np.argsort(src * max(n, 1) + dst)
+    neighbours = dst[order].tolist()
+    bounds = np.concatenate(([0], np.cumsum(np.bincount(src, minlength=n)))).tolist()
+    return [neighbours[bounds[i]:bounds[i + 1]] for i in range(n)]
+
+
+# edges (i, j) of G(n, p) drawn by Bernoulli masks over blocks of rows
+# upper=True only draws pairs with i < j, otherwise every ordered pair with i != j
+def _mask_edges(n, p, upper, rng):
+    rows_per_block = max(1, BLOCK_CELLS // max(n, 1))
+    src_parts, dst_parts = [], []
+    for start in range(0, n, rows_per_block):
+        end = min(start + rows_per_block, n)
+        mask = rng.random((end - start, n)) < p
+        rows = np.arange(start, end)
+        if upper:
+            mask &= np.arange(n)[None, :] > rows[:, None]
+        else:
+            mask[np.arange(end - start), rows] = False
+        r, c = np.nonzero(mask)
+        src_parts.append(r + start)
+        dst_parts.append(c)
+    if not src_parts:
+        return np.empty(0, dtype=np.int64), np.empty(0, dtype=np.int64)
+    return np.concatenate(src_parts).astype(np.int64), np.concatenate(dst_parts).astype(np.int64)
+
+
+# edges of G(n, p) by geometric skip sampling (Batagelj-Brandes), O(n + m) instead of O(n^2)
+# pairs are numbered row by row, the gap to the next chosen pair is geometric with parameter p
+def _skip_edges(n, p, upper, rng):
+    row_length = n - 1
+    if upper:
+        row_starts = np.concatenate(([0], np.cumsum(np.arange(n - 1, 0, -1, dtype=np.int64))))
+        total = int(row_starts[-1])
+    else:
+        total = n * row_length
+
+    positions = []
+    last = -1
+    batch = max(1024, int(total * p * 1.1) + 1)
+    while total and p > 0:
+        chosen = last + np.cumsum(rng.geometric(p, batch))
+        positions.append(chosen[chosen < total])
+        last = int(chosen[-1])
+        if last >= total:
+            break
+    if not positions:
+        return np.empty(0, dtype=np.int64), np.empty(0, dtype=np.int64)
+    k = np.concatenate(positions)
+
+    if upper:
+        src = np.searchsorted(row_starts, k, side='right') - 1
+        dst = src + 1 + (k - row_starts[src])
+    else:
+        src = k // row_length
+        dst = k % row_length
+        dst += dst >= src  # skip the diagonal
+    return src.astype(np.int64), dst.astype(np.int64)
+
+
+def _random_edges(n, p, upper, rng):
+    if p < SKIP_SAMPLING_THRESHOLD:
+        return _skip_edges(n, p, upper, rng)
+    return _mask_edges(n, p, upper, rng)
+
+
+# random parent of every vertex i in [start + 1, end) among [start, i), so the range is a tree
+def _random_tree_parents(start, end, rng):
+    children = np.arange(start + 1, end, dtype=np.int64)
+    parents = start + (rng.random(children.size) * (children - start)).astype(np.int64)
+    return parents, children
+
+
+# up to count random undirected edges u != v that are not in existing_keys and not repeated,
+# existing_keys holds min(u, v) * n + max(u, v) of the edges already present
+def _extra_edges(n, count, existing_keys, rng):
+    u = rng.integers(0, n, count)
+    v = rng.integers(0, n, count)
+    keep = u != v
+    u, v = u[keep], v[keep]
+    keys = np.minimum(u, v) * n + np.maximum(u, v)
+    _, first = np.unique(keys, return_index=True)
+    first.sort()
+    u, v, keys = u[first], v[first], keys[first]
+    fresh = ~np.isin(keys, existing_keys)
+    return u[fresh], v[fresh]
+
+
+def _undirected(u, v):
+    return np.concatenate((u, v)), np.concatenate((v, u))
 
 
+# generate a complete graph with n nodes.
 def generate_complete_graph(n):
-    adj = [[] for _ in range(n)]
-    for i in range(n):
-        for j in range(n):
-            if i != j:
-                adj[i].append(j)
-    return adj
+    return [list(range(i)) + list(range(i + 1, n)) for i in range(n)]
 
 
 # generate a dense graph with n nodes
 def generate_dense_graph(n, edge_ratio=0.8):
-    adj = [[] for _ in range(n)]
-    for i in range(n):
-        for j in range(n):
-            if i != j and random.random() < edge_ratio:
-                adj[i].append(j)
-    return adj
+    src, dst = _random_edges(n, edge_ratio, False, np.random.default_rng())
+    return _adjacency_from_edges(n, src, dst)
 
 
 # generate a sparse graph with n nodes and approximately 2n edges
 def generate_sparse_graph(n):
-    adj = [[] for _ in range(n)]
+    rng = np.random.default_rng()
     # create a spanning tree first to ensure connectivity
-    for i in range(1, n):
-        parent = random.randint(0, i - 1)
-        adj[parent].append(i)
-        adj[i].append(parent)
+    parents, children = _random_tree_parents(0, n, rng)
+    tree_keys = np.minimum(parents, children) * n + np.maximum(parents, children)
 
     # add a few more random edges to make it more than just a tree
-    extra_edges = n // 2
-    for _ in range(extra_edges):
-        u = random.randint(0, n - 1)
-        v = random.randint(0, n - 1)
-        if u != v and v not in adj[u]:
-            adj[u].append(v)
-            adj[v].append(u)
-
-    return adj
+    u, v = _extra_edges(n, n // 2, tree_keys, rng)
+    src, dst = _undirected(np.concatenate((parents, u)), np.concatenate((children, v)))
+    return _adjacency_from_edges(n, src, dst)
 
 
 # generate a binary tree with n nodes.
@@ -55,76 +140,63 @@ def generate_tree_graph(n):
 
 
 def generate_disconnected_graph(n):
-    adj = [[] for _ in range(n)]
+    rng = np.random.default_rng()
 
     # create approximately sqrt(n) components
     num_components = max(2, int(n ** 0.5))
     nodes_per_component = n // num_components
 
+    parent_parts, child_parts = [], []
     for c in range(num_components):
         start = c * nodes_per_component
         end = (c + 1) * nodes_per_component if c < num_components - 1 else n
 
         # create a small connected component
-        for i in range(start + 1, end):
-            parent = random.randint(start, i - 1)
-            adj[parent].append(i)
-            adj[i].append(parent)
+        parents, children = _random_tree_parents(start, end, rng)
+        parent_parts.append(parents)
+        child_parts.append(children)
 
-    return adj
+    src, dst = _undirected(np.concatenate(parent_parts), np.concatenate(child_parts))
+    return _adjacency_from_edges(n, src, dst)
 
 
 def generate_directed_graph(n, edge_probability=0.3):
-    adj = [[] for _ in range(n)]
-    for i in range(n):
-        for j in range(n):
-            if i != j and random.random() < edge_probability:
-                adj[i].append(j)
-    return adj
+    src, dst = _random_edges(n, edge_probability, False, np.random.default_rng())
+    return _adjacency_from_edges(n, src, dst)
 
 
 def generate_undirected_graph(n, edge_probability=0.3):
-    adj = [[] for _ in range(n)]
-    for i in range(n):
-        for j in range(i + 1, n):
-            if random.random() < edge_probability:
-                adj[i].append(j)
-                adj[j].append(i)
-    return adj
+    u, v = _random_edges(n, edge_probability, True, np.random.default_rng())
+    src, dst = _undirected(u, v)
+    return _adjacency_from_edges(n, src, dst)
 
 
 def generate_cyclic_graph(n):
+    rng = np.random.default_rng()
     # Start with a cycle
-    adj = [[] for _ in range(n)]
-    for i in range(n):
-        adj[i].append((i + 1) % n)
+    cycle_src = np.arange(n, dtype=np.int64)
+    cycle_dst = (cycle_src + 1) % n
 
     # add random extra edges
-    for _ in range(n // 2):
-        u, v = random.sample(range(n), 2)
-        if v not in adj[u]:
-            adj[u].append(v)
-            adj[v].append(u)
-    return adj
+    u, v = _extra_edges(n, n // 2, np.minimum(cycle_src, cycle_dst) * n + np.maximum(cycle_src, cycle_dst), rng)
+    src = np.concatenate((cycle_src, u, v))
+    dst = np.concatenate((cycle_dst, v, u))
+    return _adjacency_from_edges(n, src, dst)
 
 
 def generate_acyclic_graph(n):
-    adj = [[] for _ in range(n)]
-    for i in range(n):
-        for j in range(i + 1, n):
-            if random.random() < 0.2:
-                adj[i].append(j)
-    return adj
+    src, dst = _random_edges(n, 0.2, True, np.random.default_rng())
+    return _adjacency_from_edges(n, src, dst)
 
 
 def generate_weighted_graph(n):
+    rng = np.random.default_rng()
+    u, v = _random_edges(n, 0.3, True, rng)
+    weights = rng.integers(1, 11, u.size)
     adj = [{} for _ in range(n)]
-    for i in range(n):
-        for j in range(i + 1, n):
-            if random.random() < 0.3:
-                weight = random.randint(1, 10)
-                adj[i][j] = weight
-                adj[j][i] = weight
+    for i, j, weight in zip(u.tolist(), v.tolist(), weights.tolist()):
+        adj[i][j] = weight
+        adj[j][i] = weight
     return adj
 
 
@@ -160,22 +232,140 @@ def generate_grid_graph(n):
 
 
 def generate_connected_graph(n):
-    # create an empty adjacency list
-    adj = [[] for _ in range(n)]
+    rng = np.random.default_rng()
 
     # create a spanning tree to ensure connectivity
-    for i in range(1, n):
-        parent = random.randint(0, i - 1)
-        adj[parent].append(i)
-        adj[i].append(parent)
+    parents, children = _random_tree_parents(0, n, rng)
+    tree_keys = np.minimum(parents, children) * n + np.maximum(parents, children)
 
     # add a few more random edges to introduce some randomness
-    extra_edges = n // 2
-    for _ in range(extra_edges):
-        u = random.randint(0, n - 1)
-        v = random.randint(0, n - 1)
-        if u != v and v not in adj[u]:
-            adj[u].append(v)
-            adj[v].append(u)
-
+    u, v = _extra_edges(n, n // 2, tree_keys, rng)
+    src, dst = _undirected(np.concatenate((parents, u)), np.concatenate((children, v)))
+    return _adjacency_from_edges(n, src, dst)
+
+
+# generate G(n, p), every undirected pair is an edge with probability p
+def generate_gnp_graph(n, edge_probability):
+    u, v = _random_edges(n, edge_probability, True, np.random.default_rng())
+    src, dst = _undirected(u, v)
+    return _adjacency_from_edges(n, src, dst)
+
+
+# R-MAT quadrant probabilities of the Graph500 Kronecker generator, the fourth quadrant gets the rest
+RMAT_PROBABILITIES = (0.57, 0.19, 0.19)
+
+
+# undirected edges u < v of the pairs (u, v) without self-loops and repeated pairs
+# (sort and compare neighbours, np.unique without return arrays is far slower on tens of millions of keys)
+def _unique_undirected(n, u, v):
+    keep = u != v
+    keys = np.sort(np.minimum(u[keep], v[keep]) * n + np.maximum(u[keep], v[keep]))
+    keys = keys[np.concatenate(([True], keys[1:] != keys[:-1]))] if keys.size else keys
+    return keys // n, keys % n
+
+
+# R-MAT (recursive matrix) edges: every edge picks one quadrant of the adjacency matrix per bit of the
+# vertex numbers, all edges at once per level; skewed power-law like degrees as in social graphs
+# returns undirected arcs in both directions, vertex numbers shuffled so hubs are not all at low numbers
+def rmat_edges(n, edge_factor=8, probabilities=RMAT_PROBABILITIES, seed=None):
+    rng = np.random.default_rng(seed)
+    # quadrants a, b, c, d are (src bit, dst bit) = (0, 0), (0, 1), (1, 0), (1, 1)
+    bounds = np.cumsum(probabilities).astype(np.float32)
+    levels = max(1, math.ceil(math.log2(max(n, 2))))
+    count = edge_factor * n
+    # 32-bit vertex numbers and draws halve the memory traffic of the per level passes
+    index_dtype = np.int32 if n < 2 ** 31 else np.int64
+    src = np.zeros(count, dtype=index_dtype)
+    dst = np.zeros(count, dtype=index_dtype)
+    for level in range(levels):
+        r = rng.random(count, dtype=np.float32)
+        src_bit = r >= bounds[1]
+        dst_bit = (r >= bounds[0]) ^ src_bit ^ (r >= bounds[2])
+        src |= src_bit.astype(index_dtype) << level
+        dst |= dst_bit.astype(index_dtype) << level
+    inside = (src < n) & (dst < n)
+    permutation = rng.permutation(n)
+    u, v = _unique_undirected(n, permutation[src[inside]], permutation[dst[inside]])
+    return _undirected(u, v)
+
+
+# Barabasi-Albert edges by the Batagelj-Brandes endpoint list: slot 2k holds vertex k // m and slot 2k + 1
+# copies a uniformly chosen earlier slot, which picks targets proportionally to degree; the copies are
+# resolved together by pointer jumping instead of one vertex at a time
+# returns undirected arcs in both directions, about m edges per vertex after removing repeats
+def barabasi_albert_edges(n, m=3, seed=None):
+    rng = np.random.default_rng(seed)
+    slots = n * m
+    k = np.arange(slots, dtype=np.int64)
+    pointers = (rng.random(slots) * (2 * k)).astype(np.int64)
+    targets = pointers.copy()
+    odd = np.flatnonzero(targets & 1)
+    while odd.size:
+        targets[odd] = pointers[targets[odd] >> 1]
+        odd = odd[(targets[odd] & 1) == 1]
+    u, v = _unique_undirected(n, k // m, (targets >> 1) // m)
+    return _undirected(u, v)
+
+
+# random geometric edges: n uniform points in the unit square, an edge between every two points closer than
+# the radius giving the average degree; points are bucketed in radius sized cells and only neighbouring cells
+# are compared, so the work is O(n * average_degree); long diameter and local edges like road networks
+# returns undirected arcs in both directions and their Euclidean lengths
+def geometric_edges(n, average_degree=6, seed=None):
+    rng = np.random.default_rng(seed)
+    points = rng.random((n, 2))
+    radius = math.sqrt(average_degree / (math.pi * max(n, 1)))
+    cells_per_side = max(1, int(1 / radius))
+    cell_xy = np.minimum((points * cells_per_side).astype(np.int64), cells_per_side - 1)
+    cell = cell_xy[:, 0] * cells_per_side + cell_xy[:, 1]
+    order = np.argsort(cell, kind='stable')
+    points, cell_xy, cell = points[order], cell_xy[order], cell[order]
+    cell_start = np.searchsorted(cell, np.arange(cells_per_side ** 2 + 1))
+
+    src_parts, dst_parts = [], []
+    # every pair of cells once: the cell itself and four of its eight neighbours
+    for dx, dy in [(0, 0), (1, -1), (1, 0), (1, 1), (0, 1)]:
+        x, y = cell_xy[:, 0] + dx, cell_xy[:, 1] + dy
+        valid = (x >= 0) & (x < cells_per_side) & (y >= 0) & (y < cells_per_side)
+        i = np.flatnonzero(valid)
+        other = x[i] * cells_per_side + y[i]
+        counts = cell_start[other + 1] - cell_start[other]
+        src = np.repeat(i, counts)
+        dst = np.repeat(cell_start[other] - np.cumsum(counts) + counts, counts) + np.arange(counts.sum())
+        keep = np.sum((points[src] - points[dst]) ** 2, axis=1) < radius ** 2
+        if dx == 0 and dy == 0:
+            keep &= src < dst
+        src_parts.append(src[keep])
+        dst_parts.append(dst[keep])
+
+    u = order[np.concatenate(src_parts)]
+    v = order[np.concatenate(dst_parts)]
+    src, dst = _undirected(u, v)
+    points = points[np.argsort(order)]
+    return src, dst, np.sqrt(np.sum((points[src] - points[dst]) ** 2, axis=1))
+
+
+# skewed degree graph of social network kind with n nodes and about edge_factor * n edges
+def generate_rmat_graph(n, edge_factor=8, seed=None):
+    src, dst = rmat_edges(n, edge_factor, seed=seed)
+    return _adjacency_from_edges(n, src, dst)
+
+
+# preferential attachment graph with n nodes, every new node attaches to about m earlier ones
+def generate_barabasi_albert_graph(n, m=3, seed=None):
+    src, dst = barabasi_albert_edges(n, m, seed)
+    return _adjacency_from_edges(n, src, dst)
+
+
+# road-like random geometric graph with n nodes; weighted=True gives {neighbour: length} with the
+# Euclidean lengths scaled to 1..10 like the weights of the other weighted graphs
+def generate_geometric_graph(n, average_degree=6, weighted=False, seed=None):
+    src, dst, lengths = geometric_edges(n, average_degree, seed)
+    if not weighted:
+        return _adjacency_from_edges(n, src, dst)
+    radius = math.sqrt(average_degree / (math.pi * max(n, 1)))
+    weights = np.clip(np.ceil(lengths / radius * 10), 1, 10).astype(np.int64)
+    adj = [{} for _ in range(n)]
+    for i, j, weight in zip(src.tolist(), dst.tolist(), weights.tolist()):
+        adj[i][j] = weight
     return adj
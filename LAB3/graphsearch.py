@@ -2,13 +2,24 @@ import time
 import matplotlib.pyplot as plt
 from collections import deque
 import sys
+import numpy as np
 from generate_graphs import *
+from csr_graph import CSRGraph, neighbor_function, memory_per_edge
+from bitset_graph import BitsetGraph, bit_positions, words_for
+from grid_graph import GridGraph
 
 sys.setrecursionlimit(16000)
 
+# a 64-bit word with every bit set
+ALL_BITS = (1 << 64) - 1
+
 
 def bfs(adj):
+    if isinstance(adj, BitsetGraph):
+        return bfs_bitset(adj)
+
     n = len(adj)
+    neighbors = neighbor_function(adj)
     visited = [False] * n
     result = []
 
@@ -21,7 +32,7 @@ def bfs(adj):
                 vertex = queue.popleft()
                 result.append(vertex)
 
-                for neighbor in adj[vertex]:
+                for neighbor in neighbors(vertex):
                     if not visited[neighbor]:
                         visited[neighbor] = True
                         queue.append(neighbor)
@@ -29,15 +40,47 @@ def bfs(adj):
     return result
 
 
+# level by level BFS on a bitset graph: the next frontier is the OR of the frontier rows AND-NOT the visited set,
+# 64 vertices per word operation; vertices of a level are visited in ascending order
+def bfs_bitset(graph):
+    n = len(graph)
+    visited = np.zeros(words_for(n), dtype='<u8')
+    # the padding bits past n count as visited
+    if n % 64:
+        visited[-1] = ALL_BITS ^ ((1 << (n % 64)) - 1)
+    unvisited_word = 0
+    result = []
+
+    while True:
+        # first unvisited vertex starts the next component
+        while unvisited_word < len(visited) and int(visited[unvisited_word]) == ALL_BITS:
+            unvisited_word += 1
+        if unvisited_word == len(visited):
+            break
+        free = int(visited[unvisited_word]) ^ ALL_BITS
+        start = unvisited_word * 64 + (free & -free).bit_length() - 1
+
+        visited[start >> 6] |= 1 << (start & 63)
+        frontier = np.array([start])
+        while frontier.size:
+            result.extend(frontier.tolist())
+            reached = graph.union_of_rows(frontier) & ~visited
+            visited |= reached
+            frontier = bit_positions(reached)
+
+    return result
+
+
 def dfs(adj):
     n = len(adj)
+    neighbors = neighbor_function(adj)
     visited = [False] * n
     result = []
 
     def dfs_visit(u):
         visited[u] = True
         result.append(u)
-        for neighbor in adj[u]:
+        for neighbor in neighbors(u):
             if not visited[neighbor]:
                 dfs_visit(neighbor)
 
@@ -71,7 +114,10 @@ graph_types = {
     "Disconnected Graph": generate_disconnected_graph,
     "Undirected Graph": generate_undirected_graph,
     "Directed Graph": generate_directed_graph,
-    "Grid Graph": generate_grid_graph
+    "Grid Graph": generate_grid_graph,
+    "R-MAT Graph": generate_rmat_graph,
+    "Barabasi-Albert Graph": generate_barabasi_albert_graph,
+    "Geometric Graph": generate_geometric_graph
 }
 
 # remove weighted graph since it uses a different structure
@@ -81,6 +127,19 @@ if "Weighted Graph" in graph_types:
 # store results
 results_bfs = {graph_type: [] for graph_type in graph_types}
 results_dfs = {graph_type: [] for graph_type in graph_types}
+results_bfs_csr = {graph_type: [] for graph_type in graph_types}
+results_dfs_csr = {graph_type: [] for graph_type in graph_types}
+memory_lists = {}
+memory_csr = {}
+
+# dense graph types that are also searched as bitset adjacency matrices
+bitset_graph_types = ["Complete Graph", "Dense Graph"]
+results_bfs_bitset = {graph_type: [] for graph_type in bitset_graph_types}
+memory_bitset = {}
+
+# the grid is also searched as an implicit graph that computes neighbours from rows/cols
+results_bfs_implicit = []
+results_dfs_implicit = []
 
 for size in sizes:
     print(f"Testing graphs with {size} nodes...")
@@ -96,7 +155,40 @@ for size in sizes:
         dfs_time = measure_time(dfs, graph)
         results_dfs[graph_type].append(dfs_time)
 
-        print(f"  {graph_type}: BFS={bfs_time:.2f}ms, DFS={dfs_time:.2f}ms")
+        # same graph in CSR form
+        csr = CSRGraph.from_adjacency(graph)
+        results_bfs_csr[graph_type].append(measure_time(bfs, csr))
+        results_dfs_csr[graph_type].append(measure_time(dfs, csr))
+        memory_lists[graph_type] = memory_per_edge(graph)
+        memory_csr[graph_type] = memory_per_edge(csr)
+
+        # and as a bitset, where BFS expands a whole frontier per step
+        if graph_type in bitset_graph_types:
+            bitset = BitsetGraph.from_adjacency(graph)
+            results_bfs_bitset[graph_type].append(measure_time(bfs, bitset))
+            memory_bitset[graph_type] = memory_per_edge(bitset)
+
+        if graph_type == "Grid Graph":
+            grid = GridGraph.from_size(size)
+            results_bfs_implicit.append(measure_time(bfs, grid))
+            results_dfs_implicit.append(measure_time(dfs, grid))
+
+        print(f"  {graph_type}: BFS={bfs_time:.2f}ms, DFS={dfs_time:.2f}ms, "
+              f"CSR BFS={results_bfs_csr[graph_type][-1]:.2f}ms, CSR DFS={results_dfs_csr[graph_type][-1]:.2f}ms")
+
+# memory per edge of the largest graphs
+print(f"\nMemory per edge at {sizes[-1]} nodes:")
+for graph_type in graph_types:
+    line = f"  {graph_type}: lists={memory_lists[graph_type]:.1f} B, CSR={memory_csr[graph_type]:.1f} B"
+    if graph_type in memory_bitset:
+        line += f", bitset={memory_bitset[graph_type]:.2f} B"
+    print(line)
+
+# a complete graph far beyond the list sizes, built and searched only as a bitset
+large_size = 20000
+large = BitsetGraph.complete(large_size)
+print(f"\nBitset complete graph with {large_size} nodes: {large.nbytes() / 2 ** 20:.1f} MiB, "
+      f"BFS={measure_time(bfs, large):.2f}ms")
 
 # create plots
 plt.figure(figsize=(12, 8))
@@ -131,6 +223,15 @@ for graph_type in graph_types:
     plt.figure(figsize=(10, 6))
     plt.plot(sizes, results_bfs[graph_type], marker='o', label='BFS', color='pink')
     plt.plot(sizes, results_dfs[graph_type], marker='x', label='DFS', color='mediumslateblue')
+    plt.plot(sizes, results_bfs_csr[graph_type], marker='o', linestyle='--', label='BFS (CSR)', color='pink')
+    plt.plot(sizes, results_dfs_csr[graph_type], marker='x', linestyle='--', label='DFS (CSR)',
+             color='mediumslateblue')
+    if graph_type in results_bfs_bitset:
+        plt.plot(sizes, results_bfs_bitset[graph_type], marker='o', linestyle=':', label='BFS (bitset)', color='pink')
+    if graph_type == "Grid Graph":
+        plt.plot(sizes, results_bfs_implicit, marker='o', linestyle=':', label='BFS (implicit)', color='pink')
+        plt.plot(sizes, results_dfs_implicit, marker='x', linestyle=':', label='DFS (implicit)',
+                 color='mediumslateblue')
 
     plt.title(f'BFS vs DFS Performance on {graph_type}')
     plt.xlabel('Number of Nodes')
@@ -0,0 +1,94 @@
+import math
+import numpy as np
+# implicit grid graph
+# cell (r, c) is vertex r * cols + c and its neighbours are computed from rows/cols when asked for,
+# so a grid of any size costs only its optional blocked mask and per-cell weights as NumPy arrays;
+# it has the neighbors / weighted_neighbors interface of CSRGraph, so bfs, dfs and dijkstra accept it as is
+
+
+class GridGraph:
+    # blocked: (rows, cols) booleans, a blocked cell is a vertex without edges
+    # weights: (rows, cols) cost of entering each cell, 1 everywhere when None
+    # size: only cells r * cols + c < size exist, like the last partial row of generate_grid_graph
+    def __init__(self, rows, cols, blocked=None, weights=None, size=None):
+        self.rows = rows
+        self.cols = cols
+        self.size = rows * cols if size is None else size
+        if self.size > rows * cols:
+            raise ValueError(f"size {self.size} does not fit a {rows} x {cols} grid")
+        self.blocked = None
+        self.weights = None
+        self._blocked = None
+        self._weights = None
+        if blocked is not None:
+            self.blocked = np.ascontiguousarray(blocked, dtype=bool).reshape(rows * cols)
+            self._blocked = memoryview(self.blocked)
+        if weights is not None:
+            self.weights = np.ascontiguousarray(weights).reshape(rows * cols)
+            self._weights = memoryview(self.weights)
+
+    # the grid of generate_grid_graph(n): int(sqrt(n)) rows, vertices 0..n-1 row by row
+    @classmethod
+    def from_size(cls, n, blocked=None, weights=None):
+        if n == 0:
+            return cls(0, 0)
+        rows = int(math.sqrt(n))
+        return cls(rows, int(math.ceil(n / rows)), blocked, weights, size=n)
+
+    # rows x cols grid with every cell blocked with probability blocked_probability and entry costs 1..10
+    @classmethod
+    def random(cls, rows, cols, blocked_probability=0.2, seed=None):
+        rng = np.random.default_rng(seed)
+        blocked = rng.random((rows, cols)) < blocked_probability
+        return cls(rows, cols, blocked, rng.integers(1, 11, (rows, cols), dtype=np.int32))
+
+    def __len__(self):
+        return self.size
+
+    def is_open(self, u):
+        return u < self.size and (self._blocked is None or not self._blocked[u])
+
+    # up, left, right and down neighbours that exist and are not blocked, the order of generate_grid_graph
+    def neighbors(self, u):
+        if not self.is_open(u):
+            return []
+        cols = self.cols
+        c = u % cols
+        candidates = []
+        if u >= cols:
+            candidates.append(u - cols)
+        if c > 0:
+            candidates.append(u - 1)
+        if c + 1 < cols:
+            candidates.append(u + 1)
+        if u + cols < self.rows * cols:
+            candidates.append(u + cols)
+        return [v for v in candidates if self.is_open(v)]
+
+    def __getitem__(self, u):
+        return self.neighbors(u)
+
+    # (neighbour, weight) pairs, the weight of an edge is the cost of the cell it enters
+    def weighted_neighbors(self, u):
+        if self._weights is None:
+            return ((v, 1) for v in self.neighbors(u))
+        weights = self._weights
+        return ((v, weights[v]) for v in self.neighbors(u))
+
+    # number of arcs, every open pair of side by side cells counted once in each direction
+    def num_edges(self):
+        cells = np.zeros(self.rows * self.cols, dtype=bool)
+        cells[:self.size] = True
+        if self.blocked is not None:
+            cells &= ~self.blocked
+        grid = cells.reshape(self.rows, self.cols)
+        pairs = np.count_nonzero(grid[:, :-1] & grid[:, 1:]) + np.count_nonzero(grid[:-1, :] & grid[1:, :])
+        return 2 * int(pairs)
+
+    def nbytes(self):
+        total = 0
+        if self.blocked is not None:
+            total += self.blocked.nbytes
+        if self.weights is not None:
+            total += self.weights.nbytes
+        return total
@@ -0,0 +1,199 @@
+import itertools
+import os
+import sys
+import tempfile
+import time
+import numpy as np
+from csr_graph import CSRGraph
+from edge_stream import write_edge_file, DEFAULT_BATCH_EDGES, WEIGHTED, UNDIRECTED, FLOAT_WEIGHTS
+# binary graph files
+# a 64 byte header followed by the indptr, indices and weights arrays of a CSRGraph, each 8 byte aligned,
+# so load_graph only maps the file and the BFS/DFS, shortest path and MST code run on the mapped arrays;
+# the importers stream edge-list, DIMACS .gr and Matrix Market text into an edge file and build the CSR from it
+
+GRAPH_FILE_MAGIC = b'CSRG'
+GRAPH_FILE_VERSION = 1
+# index and weight dtypes are stored as NumPy dtype strings, an empty weight dtype means unweighted
+GRAPH_FILE_HEADER = np.dtype([
+    ('magic', 'S4'), ('version', '<u4'), ('n', '<u8'), ('m', '<u8'),
+    ('index_dtype', 'S4'), ('weight_dtype', 'S4'), ('reserved', 'S32')
+])
+GRAPH_FILE_ALIGNMENT = 8
+
+
+def _aligned(offset):
+    return -(-offset // GRAPH_FILE_ALIGNMENT) * GRAPH_FILE_ALIGNMENT
+
+
+# byte offsets of the three arrays for a header
+def _array_offsets(n, m, index_dtype):
+    indptr_offset = GRAPH_FILE_HEADER.itemsize
+    indices_offset = _aligned(indptr_offset + (n + 1) * np.dtype('<i8').itemsize)
+    weights_offset = _aligned(indices_offset + m * index_dtype.itemsize)
+    return indptr_offset, indices_offset, weights_offset
+
+
+# write a CSRGraph (or an adjacency list of the labs) to path, arrays are copied in blocks
+def save_graph(path, graph, block_items=DEFAULT_BATCH_EDGES):
+    if not isinstance(graph, CSRGraph):
+        graph = CSRGraph.from_adjacency(graph)
+    n, m = len(graph), graph.num_edges()
+    index_dtype = np.dtype(graph.indices.dtype).newbyteorder('<')
+    weight_dtype = np.dtype(graph.weights.dtype).newbyteorder('<') if graph.weights is not None else None
+    header = np.zeros(1, dtype=GRAPH_FILE_HEADER)
+    header[0] = (GRAPH_FILE_MAGIC, GRAPH_FILE_VERSION, n, m, index_dtype.str,
+                 weight_dtype.str if weight_dtype is not None else b'', b'')
+    offsets = _array_offsets(n, m, index_dtype)
+
+    arrays = [(graph.indptr, np.dtype('<i8')), (graph.indices, index_dtype)]
+    if weight_dtype is not None:
+        arrays.append((graph.weights, weight_dtype))
+    with open(path, 'wb') as f:
+        header.tofile(f)
+        for (array, dtype), offset in zip(arrays, offsets):
+            f.write(b'\0' * (offset - f.tell()))
+            for start in range(0, len(array), block_items):
+                np.asarray(array[start:start + block_items], dtype=dtype).tofile(f)
+
+
+# header of a graph file as (n, m, index dtype, weight dtype or None)
+def read_graph_header(path):
+    header = np.fromfile(path, dtype=GRAPH_FILE_HEADER, count=1)
+    if header.size != 1 or header['magic'][0] != GRAPH_FILE_MAGIC:
+        raise ValueError(f"{path} is not a graph file")
+    if header['version'][0] != GRAPH_FILE_VERSION:
+        raise ValueError(f"{path} has graph file version {header['version'][0]}, expected {GRAPH_FILE_VERSION}")
+    weight_dtype = header['weight_dtype'][0]
+    return (int(header['n'][0]), int(header['m'][0]), np.dtype(header['index_dtype'][0].decode()),
+            np.dtype(weight_dtype.decode()) if weight_dtype else None)
+
+
+# open a graph file as a CSRGraph over read-only memory maps, nothing is parsed or copied
+def load_graph(path):
+    n, m, index_dtype, weight_dtype = read_graph_header(path)
+    indptr_offset, indices_offset, weights_offset = _array_offsets(n, m, index_dtype)
+
+    def mapped(dtype, offset, count):
+        if count == 0:
+            return np.empty(0, dtype=dtype)
+        return np.memmap(path, dtype=dtype, mode='r', offset=offset, shape=(count,))
+
+    indptr = mapped(np.dtype('<i8'), indptr_offset, n + 1)
+    indices = mapped(index_dtype, indices_offset, m)
+    weights = mapped(weight_dtype, weights_offset, m) if weight_dtype is not None else None
+    return CSRGraph(indptr, indices, weights)
+
+
+# text lines parsed batch_edges at a time into float rows of the given columns
+def _parse_batches(lines, batch_edges, columns):
+    lines = (line for line in lines if line.strip() and line[0] not in '#%')
+    while True:
+        chunk = list(itertools.islice(lines, batch_edges))
+        if not chunk:
+            return
+        yield np.loadtxt(chunk, dtype=np.float64, usecols=columns, ndmin=2)
+
+
+# (src, dst, weights) batches from parsed rows, base is the number of the first vertex in the file
+def _edge_batches(rows_batches, base, weighted, drop_self_loops=False):
+    for rows in rows_batches:
+        src = rows[:, 0].astype(np.int64) - base
+        dst = rows[:, 1].astype(np.int64) - base
+        weights = rows[:, 2] if weighted else None
+        if drop_self_loops:
+            keep = src != dst
+            src, dst = src[keep], dst[keep]
+            weights = weights[keep] if weighted else None
+        if src.size and min(src.min(), dst.min()) < 0:
+            raise ValueError(f"vertex numbers start at {base}")
+        yield (src, dst, weights) if weighted else (src, dst)
+
+
+# edge file -> CSR in bounded memory -> graph file, the edge file and the CSR arrays live in a temporary
+# directory next to out_path; returns the mapped graph
+def _convert(out_path, n, batches, flags, batch_edges):
+    with tempfile.TemporaryDirectory(dir=os.path.dirname(os.path.abspath(out_path))) as tmp:
+        edge_path = os.path.join(tmp, "edges.bin")
+        write_edge_file(edge_path, n, batches, flags)
+        graph = CSRGraph.from_edge_file(edge_path, out_dir=tmp, batch_edges=batch_edges)
+        save_graph(out_path, graph)
+        del graph
+    return load_graph(out_path)
+
+
+# edge list with one "u v" or "u v w" line per edge, vertices numbered from 0, '#' and '%' lines are comments;
+# n is the largest vertex number + 1
+def import_edge_list(text_path, out_path, undirected=False, weighted=False, float_weights=False,
+                     batch_edges=DEFAULT_BATCH_EDGES):
+    flags = (UNDIRECTED if undirected else 0) | (WEIGHTED if weighted else 0)
+    if weighted and float_weights:
+        flags |= FLOAT_WEIGHTS
+    columns = (0, 1, 2) if weighted else (0, 1)
+    with open(text_path) as f:
+        batches = _edge_batches(_parse_batches(f, batch_edges, columns), 0, weighted)
+        return _convert(out_path, None, batches, flags, batch_edges)
+
+
+# DIMACS shortest path format (.gr): "p sp n m" once, then "a u v w" arcs numbered from 1, "c" lines are comments
+def import_dimacs(text_path, out_path, batch_edges=DEFAULT_BATCH_EDGES):
+    with open(text_path) as f:
+        n = None
+        for line in f:
+            if line.startswith('p'):
+                n = int(line.split()[2])
+                break
+        if n is None:
+            raise ValueError(f"{text_path} has no 'p sp n m' line")
+        arcs = (line[1:] for line in f if line.startswith('a'))
+        batches = _edge_batches(_parse_batches(arcs, batch_edges, (0, 1, 2)), 1, True)
+        return _convert(out_path, n, batches, WEIGHTED, batch_edges)
+
+
+# Matrix Market coordinate matrix (.mtx): entry (i, j) is an edge i -> j numbered from 1, pattern matrices
+# are unweighted and symmetric ones undirected, with their diagonal entries dropped
+def import_matrix_market(text_path, out_path, batch_edges=DEFAULT_BATCH_EDGES):
+    with open(text_path) as f:
+        banner = f.readline().lower().split()
+        if len(banner) != 5 or banner[0] != '%%matrixmarket' or banner[1:3] != ['matrix', 'coordinate']:
+            raise ValueError(f"{text_path} is not a Matrix Market coordinate matrix")
+        field, symmetry = banner[3], banner[4]
+        if field not in ('pattern', 'integer', 'real'):
+            raise ValueError(f"unsupported Matrix Market field {field}")
+        for line in f:
+            if line.strip() and not line.startswith('%'):
+                rows, cols = (int(value) for value in line.split()[:2])
+                break
+        else:
+            raise ValueError(f"{text_path} has no size line")
+
+        weighted = field != 'pattern'
+        undirected = symmetry != 'general'
+        flags = (UNDIRECTED if undirected else 0) | (WEIGHTED if weighted else 0)
+        if field == 'real':
+            flags |= FLOAT_WEIGHTS
+        columns = (0, 1, 2) if weighted else (0, 1)
+        batches = _edge_batches(_parse_batches(f, batch_edges, columns), 1, weighted, drop_self_loops=undirected)
+        return _convert(out_path, max(rows, cols), batches, flags, batch_edges)
+
+
+# importer by file extension
+graph_importers = {
+    ".txt": import_edge_list,
+    ".edges": import_edge_list,
+    ".gr": import_dimacs,
+    ".mtx": import_matrix_market
+}
+
+
+# python graph_file.py <input> <output>: convert a text graph to a graph file and report the load time
+if __name__ == "__main__":
+    text_path, out_path = sys.argv[1], sys.argv[2]
+    importer = graph_importers[os.path.splitext(text_path)[1].lower()]
+
+    start_time = time.time()
+    importer(text_path, out_path)
+    print(f"Imported {text_path} in {time.time() - start_time:.2f} sec")
+
+    start_time = time.time()
+    graph = load_graph(out_path)
+    print(f"Loaded {len(graph)} vertices and {graph.num_edges()} arcs in {time.time() - start_time:.6f} sec")
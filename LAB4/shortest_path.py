@@ -13,12 +13,19 @@ from generate_graphs import (
     generate_weighted_graph,
     generate_grid_graph,
     generate_connected_graph,
-    generate_disconnected_graph
+    generate_disconnected_graph,
+    generate_rmat_graph,
+    generate_barabasi_albert_graph,
+    generate_geometric_graph
 )
+from adaptive_sweep import adaptive_sweep, extrapolate
+from csr_graph import CSRGraph, edge_function, memory_per_edge
+from grid_graph import GridGraph
 
 
 def dijkstra(adj, start):
     n = len(adj)
+    edges = edge_function(adj)
     dist = [float('inf')] * n
     dist[start] = 0
     visited = [False] * n
@@ -38,7 +45,7 @@ def dijkstra(adj, start):
         visited[u] = True
         nodes_to_process.remove(u)
 
-        for v, weight in adj[u].items():
+        for v, weight in edges(u):
             if not visited[v]:
                 if dist[v] > dist[u] + weight:
                     dist[v] = dist[u] + weight
@@ -49,12 +56,13 @@ def dijkstra(adj, start):
 
 def floyd_warshall(adj):
     n = len(adj)
+    edges = edge_function(adj)
     dist = [[float('inf')] * n for _ in range(n)]
 
     # Initialize distance matrix
     for i in range(n):
         dist[i][i] = 0
-        for j, weight in adj[i].items():
+        for j, weight in edges(i):
             dist[i][j] = weight
 
     # Floyd-Warshall main algorithm
@@ -91,23 +99,55 @@ def test_floyd_warshall(adj):
     return time.time() - start_time
 
 
+# weighted generator for each graph type
+weighted_graph_generators = {
+    "Complete": lambda n: add_weights(generate_complete_graph(n)),
+    "Dense": lambda n: add_weights(generate_dense_graph(n)),
+    "Sparse": lambda n: add_weights(generate_sparse_graph(n)),
+    "Tree": lambda n: add_weights(generate_tree_graph(n)),
+    "Directed": lambda n: add_weights(generate_directed_graph(n)),
+    "Undirected": lambda n: add_weights(generate_undirected_graph(n)),
+    "Cyclic": lambda n: add_weights(generate_cyclic_graph(n)),
+    "Acyclic": lambda n: add_weights(generate_acyclic_graph(n)),
+    "Weighted": generate_weighted_graph,  # already weighted
+    "Grid": lambda n: add_weights(generate_grid_graph(n)),
+    "Connected": lambda n: add_weights(generate_connected_graph(n)),
+    "Disconnected": lambda n: add_weights(generate_disconnected_graph(n)),
+    "R-MAT": lambda n: add_weights(generate_rmat_graph(n)),
+    "Barabasi-Albert": lambda n: add_weights(generate_barabasi_albert_graph(n)),
+    "Geometric": lambda n: generate_geometric_graph(n, weighted=True)  # weights are edge lengths
+}
+
+algorithm_tests = {
+    'Dijkstra': test_dijkstra,
+    'Floyd-Warshall': test_floyd_warshall
+}
+
+
 # Generate weighted versions of all graph types
 def generate_all_weighted_graphs(n):
-    graphs = {
-        "Complete": add_weights(generate_complete_graph(n)),
-        "Dense": add_weights(generate_dense_graph(n)),
-        "Sparse": add_weights(generate_sparse_graph(n)),
-        "Tree": add_weights(generate_tree_graph(n)),
-        "Directed": add_weights(generate_directed_graph(n)),
-        "Undirected": add_weights(generate_undirected_graph(n)),
-        "Cyclic": add_weights(generate_cyclic_graph(n)),
-        "Acyclic": add_weights(generate_acyclic_graph(n)),
-        "Weighted": generate_weighted_graph(n),  # already weighted
-        "Grid": add_weights(generate_grid_graph(n)),
-        "Connected": add_weights(generate_connected_graph(n)),
-        "Disconnected": add_weights(generate_disconnected_graph(n))
-    }
-    return graphs
+    return {graph_type: generator(n) for graph_type, generator in weighted_graph_generators.items()}
+
+
+# bytes per edge of every weighted graph type as dict adjacency and as CSR
+def report_memory_per_edge(n):
+    print(f"Memory per edge at {n} nodes:")
+    for graph_type, adj in generate_all_weighted_graphs(n).items():
+        csr = CSRGraph.from_adjacency(adj)
+        print(f"  {graph_type}: dicts={memory_per_edge(adj):.1f} B, CSR={memory_per_edge(csr):.1f} B")
+
+
+# Dijkstra from the corner of a random weighted grid with blocked cells, implicit and as dict adjacency
+def report_implicit_grid(rows, cols):
+    grid = GridGraph.random(rows, cols)
+    # the search starts in the corner, keep it open
+    grid.blocked[0] = False
+    adj = [dict(grid.weighted_neighbors(u)) for u in range(len(grid))]
+    print(f"Dijkstra on a {rows} x {cols} grid:")
+    for name, graph in [("implicit", grid), ("dicts", adj)]:
+        start_time = time.time()
+        dijkstra(graph, 0)
+        print(f"  {name}: {time.time() - start_time:.3f} sec, {memory_per_edge(graph):.1f} B per edge")
 
 
 def plot_overall_results(sizes, results):
@@ -167,12 +207,16 @@ def plot_individual_graph_results(sizes, results):
             plt.show()
 
 
-def run_tests(max_nodes=500, step=10):
+# algorithms named in sweep_budgets are not run on the fixed sizes, instead each graph type is swept
+# until the budget (seconds) runs out and the result is stored in results['Sweeps'][algorithm][graph_type]
+def run_tests(max_nodes=500, step=10, sweep_budgets=None):
+    sweep_budgets = sweep_budgets or {}
     sizes = list(range(1, max_nodes + 1, step))
     graph_types = [
         "Complete", "Dense", "Sparse", "Tree",
         "Directed", "Undirected", "Cyclic", "Acyclic",
-        "Weighted", "Grid", "Connected", "Disconnected"
+        "Weighted", "Grid", "Connected", "Disconnected",
+        "R-MAT", "Barabasi-Albert", "Geometric"
     ]
 
     results = {
@@ -187,27 +231,51 @@ def run_tests(max_nodes=500, step=10):
         for graph_type in graph_types:
             adj = graphs[graph_type]
 
-            # test Dijkstra
-            try:
-                time_dijkstra = test_dijkstra(adj)
-                results['Dijkstra'][graph_type].append(time_dijkstra)
-            except Exception as e:
-                print(f"Error with Dijkstra on {graph_type} graph (size {size}): {e}")
-                results['Dijkstra'][graph_type].append(float('nan'))
-
-            # Test Floyd-Warshall
-            try:
-                time_floyd = test_floyd_warshall(adj)
-                results['Floyd-Warshall'][graph_type].append(time_floyd)
-            except Exception as e:
-                print(f"Error with Floyd-Warshall on {graph_type} graph (size {size}): {e}")
-                results['Floyd-Warshall'][graph_type].append(float('nan'))
+            for algorithm, test in algorithm_tests.items():
+                if algorithm in sweep_budgets:
+                    continue
+                try:
+                    results[algorithm][graph_type].append(test(adj))
+                except Exception as e:
+                    print(f"Error with {algorithm} on {graph_type} graph (size {size}): {e}")
+                    results[algorithm][graph_type].append(float('nan'))
+
+    # budgeted sweeps, a new graph is generated for every size the sweep asks for
+    results['Sweeps'] = {algorithm: {} for algorithm in sweep_budgets}
+    for algorithm, budget in sweep_budgets.items():
+        test = algorithm_tests[algorithm]
+        for graph_type in graph_types:
+            generator = weighted_graph_generators[graph_type]
+            print(f"Sweeping {algorithm} on {graph_type} graph")
+            results['Sweeps'][algorithm][graph_type] = adaptive_sweep(
+                lambda n: test(generator(n)), sizes[0], budget)
 
     return sizes, results
 
 
+def plot_sweep_results(sizes, results):
+    for algorithm, sweeps in results.get('Sweeps', {}).items():
+        plt.figure(figsize=(12, 6))
+        for graph_type, (run_sizes, times) in sweeps.items():
+            line, = plt.plot(run_sizes, times, marker='o', label=graph_type)
+            # dashed extrapolation up to the largest fixed size
+            rest = [size for size in sizes if size > run_sizes[-1]]
+            if rest:
+                plt.plot([run_sizes[-1]] + rest, [times[-1]] + extrapolate(run_sizes, times, rest),
+                         linestyle='--', color=line.get_color())
+        plt.title(f'{algorithm} Algorithm Performance (time-budgeted sweep)')
+        plt.xlabel('Number of Nodes')
+        plt.ylabel('Time (seconds)')
+        plt.legend()
+        plt.grid(True)
+        plt.show()
+
+
 # main execution
 if __name__ == "__main__":
-    sizes, results = run_tests(max_nodes=300, step=10)
+    sizes, results = run_tests(max_nodes=300, step=10, sweep_budgets={'Floyd-Warshall': 5.0})
     plot_overall_results(sizes, results)
     plot_individual_graph_results(sizes, results)
+    plot_sweep_results(sizes, results)
+    report_memory_per_edge(sizes[-1])
+    report_implicit_grid(200, 200)
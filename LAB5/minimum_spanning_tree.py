@@ -13,8 +13,12 @@ from generate_graphs import (
     generate_acyclic_graph,
     generate_weighted_graph,
     generate_grid_graph,
-    generate_connected_graph
+    generate_connected_graph,
+    generate_rmat_graph,
+    generate_barabasi_albert_graph,
+    generate_geometric_graph
 )
+from csr_graph import CSRGraph, edge_function, memory_per_edge
 
 
 # convert unweighted to weighted
@@ -32,6 +36,7 @@ def convert_to_weighted(adj):
 # Kruskal's algorithm
 def kruskal(adj):
     n = len(adj)
+    neighbours = edge_function(adj)
     parent = list(range(n))
 
     def find(u):
@@ -49,7 +54,7 @@ def kruskal(adj):
 
     edges = []
     for u in range(n):
-        for v, w in adj[u].items():
+        for v, w in neighbours(u):
             if u < v:
                 edges.append((w, u, v))
 
@@ -64,6 +69,7 @@ def kruskal(adj):
 # Prim's algorithm
 def prim(adj):
     n = len(adj)
+    edges = edge_function(adj)
     selected = [False] * n
     selected[0] = True
     mst_weight = 0
@@ -73,7 +79,7 @@ def prim(adj):
         u, v = -1, -1
         for i in range(n):
             if selected[i]:
-                for j, w in adj[i].items():
+                for j, w in edges(i):
                     if not selected[j] and w < min_edge:
                         min_edge = w
                         u, v = i, j
@@ -109,7 +115,10 @@ def generate_all_weighted_graphs(n):
         "Acyclic": convert_to_weighted(generate_acyclic_graph(n)),
         "Weighted": generate_weighted_graph(n),
         "Grid": convert_to_weighted(generate_grid_graph(n)),
-        "Connected": convert_to_weighted(generate_connected_graph(n))
+        "Connected": convert_to_weighted(generate_connected_graph(n)),
+        "R-MAT": convert_to_weighted(generate_rmat_graph(n)),
+        "Barabasi-Albert": convert_to_weighted(generate_barabasi_albert_graph(n)),
+        "Geometric": generate_geometric_graph(n, weighted=True)
     }
 
 
@@ -119,7 +128,7 @@ def run_tests(max_nodes=300, step=10):
     graph_types = [
         "Complete", "Dense", "Sparse", "Tree", "Disconnected",
         "Directed", "Undirected", "Cyclic", "Acyclic",
-        "Weighted", "Grid", "Connected"
+        "Weighted", "Grid", "Connected", "R-MAT", "Barabasi-Albert", "Geometric"
     ]
     results = {
         'Kruskal': {gt: [] for gt in graph_types},
@@ -146,6 +155,14 @@ def run_tests(max_nodes=300, step=10):
     return sizes, results
 
 
+# bytes per edge of every weighted graph type as dict adjacency and as CSR
+def report_memory_per_edge(n):
+    print(f"Memory per edge at {n} nodes:")
+    for graph_type, adj in generate_all_weighted_graphs(n).items():
+        csr = CSRGraph.from_adjacency(adj)
+        print(f"  {graph_type}: dicts={memory_per_edge(adj):.1f} B, CSR={memory_per_edge(csr):.1f} B")
+
+
 # plotting functions
 def plot_overall_mst_results(sizes, results):
     plt.figure(figsize=(12, 8))
@@ -204,3 +221,4 @@ if __name__ == "__main__":
     sizes, results = run_tests(max_nodes=200, step=20)
     plot_overall_mst_results(sizes, results)
     plot_individual_mst_results(sizes, results)
+    report_memory_per_edge(sizes[-1])